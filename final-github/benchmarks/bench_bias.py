@@ -0,0 +1,84 @@
+"""Online gyro bias tracking on a replay log whose bias drifts.
+
+Writes a synthetic IMU log in the replay backend's CSV format: the board
+lies still except for a few seconds of handling, while the gyro bias
+creeps the way it does when the sensor warms up. The log is then fed
+through IMUHandler's filter with the log's own dt, once with ONLINE_BIAS
+and once with the startup calibration only. Prints the final bias error
+and roll/pitch error of both.
+
+Run from final-github/:  python -m benchmarks.bench_bias --seconds 120
+Exits with status 1 if online tracking doesn't at least halve the error.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+
+from utils.hardware import IMUHandler
+from utils.imu_backends import ReplaySensor
+
+G = 9.80665
+
+def bias_at(t, seconds, start=(0.010, -0.010, 0.005), end=(0.030, 0.010, 0.020)):
+    k = min(t / seconds, 1.0)
+    return tuple(a + (b - a) * k for a, b in zip(start, end))
+
+def write_log(path, seconds, rate_hz=200, handled=(40.0, 44.0), seed=0):
+    """Still board, gyro bias drifting from start to end, and a burst of
+    rotation while it is handled (which the estimator must ignore)."""
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("t,ax,ay,az,gx,gy,gz\n")
+        for i in range(int(seconds * rate_hz)):
+            t = i / rate_hz
+            bx, by, bz = bias_at(t, seconds)
+            spin = 1.5 * math.sin(2 * math.pi * (t - handled[0])) if handled[0] <= t < handled[1] else 0.0
+            f.write(f"{t:.5f},{rng.gauss(0, 0.02):.5f},{rng.gauss(0, 0.02):.5f},"
+                    f"{G + rng.gauss(0, 0.02):.5f},{bx + spin + rng.gauss(0, 0.003):.5f},"
+                    f"{by + rng.gauss(0, 0.003):.5f},{bz + rng.gauss(0, 0.003):.5f}\n")
+
+def replay(rows, online):
+    # Mock backend: no sensor, just the filter state; offsets start at the
+    # bias a startup calibration would have measured
+    imu = IMUHandler(threaded=False, fifo=False, backend="mock")
+    imu.online_bias = online
+    imu.gx_off, imu.gy_off, imu.gz_off = bias_at(0.0, 1.0)
+    prev = None
+    for t, ax, ay, az, gx, gy, gz in rows:
+        if prev is not None:
+            imu._filter(ax, ay, az, gx, gy, gz, t - prev)
+        prev = t
+    return imu
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--seconds", type=float, default=120.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_log(path, args.seconds, seed=args.seed)
+        rows = ReplaySensor(path).rows
+    finally:
+        os.remove(path)
+
+    true_bias = bias_at(args.seconds, args.seconds)
+    errors = {}
+    for name, online in (("calibration only", False), ("online bias", True)):
+        imu = replay(rows, online)
+        err = math.sqrt(sum((o - b) ** 2 for o, b in
+                            zip((imu.gx_off, imu.gy_off, imu.gz_off), true_bias)))
+        roll, pitch = imu.q.to_euler()
+        errors[name] = err
+        print(f"{name:>16}: bias error {err * 1000:.2f} mrad/s, roll {roll:+.2f} deg, "
+              f"pitch {pitch:+.2f} deg, updates {imu.bias_updates}")
+    if errors["online bias"] > errors["calibration only"] / 2:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Sprite-group vs NumPy entity backend at increasing entity counts.
+
+Runs benchmarks.bench_game for each backend and enemy count (bullets scale
+with it) and prints one table row per count: update, collision and draw ms
+per frame, plus overall fps.
+
+Run from final-github/:  python -m benchmarks.bench_entities --counts 25 100 400
+"""
+import argparse
+import json
+
+from benchmarks.bench_game import run
+
+BACKENDS = ("sprites", "numpy")
+
+def sweep(counts, frames=600, seed=0):
+    rows = []
+    for n in counts:
+        row = {"enemies": n, "bullets": max(n // 4, 4)}
+        for backend in BACKENDS:
+            r = run(frames=frames, enemies=n, bullets=row["bullets"], shoot_every=2,
+                    seed=seed, backend=backend)
+            row[backend] = {
+                "fps": r["fps"],
+                "update_ms": r["phase_ms"]["update"],
+                "collision_ms": r["phase_ms"]["collision"],
+                "draw_ms": r["phase_ms"]["draw"],
+            }
+        rows.append(row)
+    return rows
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--counts", type=int, nargs="+", default=[25, 50, 100, 200, 400, 800])
+    ap.add_argument("--frames", type=int, default=600)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args()
+
+    rows = sweep(args.counts, args.frames, args.seed)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'enemies':>7} {'backend':>8} {'fps':>8} {'update':>8} {'collide':>8} {'draw':>8}")
+    for row in rows:
+        for backend in BACKENDS:
+            r = row[backend]
+            print(f"{row['enemies']:>7} {backend:>8} {r['fps']:>8.0f} {r['update_ms']:>8.3f} "
+                  f"{r['collision_ms']:>8.3f} {r['draw_ms']:>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Headless benchmark of the real game frame: input, IMU, update, collision,
+draw and flip, under SDL's dummy video driver with scripted IMU and shooting.
+
+Run from final-github/:
+    python -m benchmarks.bench_game --frames 3000 --enemies 40 --bullets 24
+Prints one JSON object (or writes it with --out).
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from constants.global_var import *
+from classes.Plane import Plane
+from classes.Bullet import Bullet
+from classes.Enemy import Enemy
+from classes.World import create_world
+from utils.assets import assets
+from utils.render import Renderer
+from utils.text import ScoreHUD
+
+PHASES = ("input", "imu", "update", "collision", "draw", "flip")
+
+class ScriptedIMU:
+    """Stands in for IMUHandler: slow figure-eight tilt so the plane sweeps
+    the whole play area."""
+
+    def __init__(self, amplitude=30.0, period=4.0):
+        self.amplitude = amplitude
+        self.period = period
+        self.t = 0.0
+
+    def update(self, dt):
+        self.t += dt
+        a = 2 * math.pi * self.t / self.period
+        return self.amplitude * math.sin(a), self.amplitude * math.sin(2 * a) / 2
+
+def percentile(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(round(p / 100.0 * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+def run(frames=2000, enemies=20, bullets=16, shoot_every=4, dt=1.0 / FPS,
+        dirty=DIRTY_RENDERING, warmup=60, seed=0, waves=None, backend=ENTITY_BACKEND):
+    random.seed(seed)
+    pygame.init()
+    screen = pygame.display.set_mode((W, H))
+    renderer = Renderer(screen, dirty=dirty)
+    assets.preload([Plane.load_image, Bullet.load_image, Enemy.load_image])
+    font_small = pygame.font.Font(None, 28)
+    score_hud = ScoreHUD(font_small)
+
+    # Without a wave file the density is held at `enemies` by topping up
+    world = create_world(backend, bullet_pool_size=bullets, enemy_pool_size=enemies, waves=waves)
+    imu = ScriptedIMU()
+    renderer.clear_screen()
+
+    phase_totals = dict.fromkeys(PHASES, 0.0)
+    frame_times = []
+    crashes = 0
+    clock = time.perf_counter
+
+    for frame in range(frames + warmup):
+        t0 = clock()
+        pygame.event.pump()
+        pygame.event.get()
+        if frame % shoot_every == 0:
+            world.fire()
+        t1 = clock()
+        roll, pitch = imu.update(dt)
+        t2 = clock()
+
+        # Same steps as World.simulate(), split so update/collision are timed apart
+        world.begin_frame()
+        t_update = t_collide = 0.0
+        for _ in range(world.timestep.advance(dt)):
+            while waves is None and len(world.enemies) < enemies:
+                world.spawn_enemy()
+            a = clock()
+            world.update_step(roll, pitch)
+            b = clock()
+            if world.collide_step():
+                crashes += 1
+            t_update += b - a
+            t_collide += clock() - b
+        t3 = clock()
+
+        world.draw(renderer, score_hud)
+        t4 = clock()
+        renderer.present()
+        t5 = clock()
+
+        if frame < warmup:
+            continue
+        frame_times.append(t5 - t0)
+        phase_totals["input"] += t1 - t0
+        phase_totals["imu"] += t2 - t1
+        phase_totals["update"] += t_update
+        phase_totals["collision"] += t_collide
+        phase_totals["draw"] += t4 - t3
+        phase_totals["flip"] += t5 - t4
+
+    total = sum(frame_times)
+    ordered = sorted(frame_times)
+    result = {
+        "config": {
+            "frames": frames, "enemies": enemies, "bullets": bullets,
+            "shoot_every": shoot_every, "dt": dt, "dirty": dirty, "seed": seed, "waves": waves,
+            "backend": backend,
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        },
+        "fps": frames / total if total else 0.0,
+        "frame_ms": {
+            "mean": total / frames * 1000.0 if frames else 0.0,
+            "p50": percentile(ordered, 50) * 1000.0,
+            "p95": percentile(ordered, 95) * 1000.0,
+            "p99": percentile(ordered, 99) * 1000.0,
+            "max": (ordered[-1] if ordered else 0.0) * 1000.0,
+        },
+        "phase_ms": {k: v / frames * 1000.0 for k, v in phase_totals.items()},
+        "crashes": crashes,
+        "score": world.score,
+        "pushed_pixels_per_frame": renderer.pushed_pixels / (frames + warmup),
+        "world": world.stats(),
+        "assets": assets.stats(),
+        "score_rebuilds": score_hud.rebuilds,
+    }
+    pygame.quit()
+    return result
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=2000)
+    ap.add_argument("--enemies", type=int, default=20, help="enemies kept alive")
+    ap.add_argument("--bullets", type=int, default=16, help="max bullets in flight")
+    ap.add_argument("--shoot-every", type=int, default=4, help="frames between shots")
+    ap.add_argument("--dt", type=float, default=1.0 / FPS, help="simulated seconds per frame")
+    ap.add_argument("--full-flip", action="store_true", help="disable dirty-rect rendering")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--backend", default=ENTITY_BACKEND, choices=("sprites", "numpy"))
+    ap.add_argument("--waves", help="spawn from this wave file (e.g. waves/stress.json) "
+                                    "instead of holding --enemies constant")
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    args = ap.parse_args()
+
+    result = run(args.frames, args.enemies, args.bullets, args.shoot_every, args.dt,
+                 dirty=not args.full_flip, seed=args.seed, waves=args.waves,
+                 backend=args.backend)
+    text = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
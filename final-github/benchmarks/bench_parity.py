@@ -0,0 +1,68 @@
+"""Checks that the sprite and NumPy entity backends play the same game.
+
+Runs benchmarks.bench_game with the same seed on both backends for each
+workload and compares what the game produced: crashes, score, enemies
+spawned and pool high-water marks. Timings are not compared. Exits with
+status 1 if any workload differs.
+
+Run from final-github/:  python -m benchmarks.bench_parity --frames 3000
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.bench_game import run
+
+BACKENDS = ("sprites", "numpy")
+
+# (name, bench_game.run keyword arguments)
+WORKLOADS = (
+    ("topped-up 20", {}),
+    ("topped-up 100", {"enemies": 100, "bullets": 25, "shoot_every": 2}),
+    ("default waves", {"waves": "waves/default.json"}),
+    ("stress waves", {"waves": "waves/stress.json"}),
+)
+
+def outcome(result):
+    world = result["world"]
+    spawner = world.get("spawner")
+    return {
+        "crashes": result["crashes"],
+        "score": result["score"],
+        "spawned": spawner["spawned"] if spawner else None,
+        "enemy_high_water": world["enemies"]["high_water"],
+        "bullet_high_water": world["bullets"]["high_water"],
+    }
+
+def compare(frames=3000, seed=0):
+    rows = []
+    for name, kwargs in WORKLOADS:
+        row = {"workload": name}
+        for backend in BACKENDS:
+            row[backend] = outcome(run(frames=frames, seed=seed, backend=backend, **kwargs))
+        row["same"] = row["sprites"] == row["numpy"]
+        rows.append(row)
+    return rows
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=3000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args()
+
+    rows = compare(args.frames, args.seed)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"{'workload':>14} {'backend':>8} {'crashes':>8} {'score':>6} {'spawned':>8} {'same':>5}")
+        for row in rows:
+            for backend in BACKENDS:
+                r = row[backend]
+                print(f"{row['workload']:>14} {backend:>8} {r['crashes']:>8} {r['score']:>6} "
+                      f"{str(r['spawned']):>8} {str(row['same']):>5}")
+    if not all(row["same"] for row in rows):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
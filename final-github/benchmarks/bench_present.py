@@ -0,0 +1,93 @@
+"""Cost of getting a frame to the panel: SDL's display.flip()/update() vs
+FramebufferPresenter writing RGB565 into an mmap()ed framebuffer.
+
+Without --device the presenter writes to a temporary regular file standing
+in for /dev/fbN, so this also runs on a desktop (SDL_VIDEODRIVER=dummy).
+
+Run from final-github/:  python -m benchmarks.bench_present [--device /dev/fb1]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import pygame
+from constants.global_var import W, H
+from utils.framebuffer import FbInfo, FramebufferPresenter
+
+def make_rects(rng, n, size=16):
+    return [pygame.Rect(rng.randrange(W - size), rng.randrange(H - size), size, size)
+            for _ in range(n)]
+
+def scribble(screen, rects, rng):
+    for r in rects:
+        screen.fill((rng.randrange(256), rng.randrange(256), rng.randrange(256)), r)
+
+def time_path(present, screen, frames, rect_sets, rng):
+    """ms per frame for full pushes and for small dirty-rect pushes."""
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((rng.randrange(256), 0, 0))
+        present(None)
+    full = (time.perf_counter() - t0) / frames * 1000.0
+    t0 = time.perf_counter()
+    for i in range(frames):
+        rects = rect_sets[i % len(rect_sets)]
+        scribble(screen, rects, rng)
+        present(rects)
+    dirty = (time.perf_counter() - t0) / frames * 1000.0
+    return {"full_ms": full, "dirty_ms": dirty}
+
+def run(frames=300, rects=20, bpp=16, device=None, seed=0):
+    pygame.init()
+    screen = pygame.display.set_mode((W, H))
+    rng = random.Random(seed)
+    rect_sets = [make_rects(rng, rects) for _ in range(16)]
+
+    def sdl_present(rs):
+        if rs is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rs)
+
+    result = {
+        "config": {"frames": frames, "rects": rects, "device": device or "tempfile",
+                   "video_driver": os.environ.get("SDL_VIDEODRIVER")},
+        "sdl": time_path(sdl_present, screen, frames, rect_sets, rng),
+    }
+
+    tmp = None
+    if device is None:
+        info = FbInfo(W, H, bpp=bpp) if bpp == 16 else \
+            FbInfo(W, H, bpp=32, red=(16, 8), green=(8, 8), blue=(0, 8))
+        tmp = tempfile.NamedTemporaryFile(prefix="fb", delete=False)
+        tmp.write(bytes(info.size))
+        tmp.close()
+        presenter = FramebufferPresenter(screen, tmp.name, info)
+    else:
+        presenter = FramebufferPresenter(screen, device)
+    try:
+        result["framebuffer"] = time_path(presenter.present, screen, frames, rect_sets, rng)
+        result["framebuffer"]["format"] = repr(presenter.info)
+    finally:
+        presenter.close()
+        if tmp is not None:
+            os.unlink(tmp.name)
+    pygame.quit()
+    return result
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--rects", type=int, default=20, help="16x16 dirty rects per frame")
+    ap.add_argument("--bpp", type=int, default=16, choices=(16, 32),
+                    help="pixel format of the stand-in file")
+    ap.add_argument("--device", help="real framebuffer, e.g. /dev/fb1")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    print(json.dumps(run(args.frames, args.rects, args.bpp, args.device, args.seed), indent=2))
+
+if __name__ == "__main__":
+    main()
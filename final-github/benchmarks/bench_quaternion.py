@@ -0,0 +1,79 @@
+"""Per-sample cost of the orientation filter: object-based Quaternion path
+(the original IMUHandler.update) vs the in-place FastQuaternion step.
+
+Run from final-github/:  python -m benchmarks.bench_quaternion
+"""
+import math
+import random
+import sys
+import time
+
+from constants.global_var import FILTER_BETA
+from utils.quaternion import Quaternion, FastQuaternion
+
+def reference_step(q, ax, ay, az, gx, gy, gz, dt, beta=FILTER_BETA):
+    """Original allocate-per-op filter step, kept as the baseline."""
+    q_delta = Quaternion(1.0, gx*dt*0.5, gy*dt*0.5, gz*dt*0.5)
+    q = (q * q_delta).normalize()
+
+    accel_norm = math.sqrt(ax*ax + ay*ay + az*az)
+    if accel_norm > 0.1:
+        axn, ayn, azn = ax/accel_norm, ay/accel_norm, az/accel_norm
+        vx = 2*(q.x*q.z - q.w*q.y)
+        vy = 2*(q.y*q.z + q.w*q.x)
+        vz = q.w*q.w - q.x*q.x - q.y*q.y + q.z*q.z
+
+        ex = (ayn*vz) - (azn*vy)
+        ey = (azn*vx) - (axn*vz)
+        ez = (axn*vy) - (ayn*vx)
+
+        q_corr = Quaternion(1.0, beta*ex, beta*ey, beta*ez)
+        q = (q * q_corr).normalize()
+    return q
+
+def make_samples(n, seed=0):
+    rng = random.Random(seed)
+    return [(rng.gauss(0, 2), rng.gauss(0, 2), 9.81 + rng.gauss(0, 1),
+             rng.gauss(0, 0.5), rng.gauss(0, 0.5), rng.gauss(0, 0.5), 0.005)
+            for _ in range(n)]
+
+def run_reference(samples):
+    q = Quaternion(1, 0, 0, 0)
+    out = []
+    for s in samples:
+        q = reference_step(q, *s)
+        out.append(q.to_euler())
+    return out
+
+def run_fast(samples):
+    q = FastQuaternion(1, 0, 0, 0)
+    out = []
+    for ax, ay, az, gx, gy, gz, dt in samples:
+        q.integrate(ax, ay, az, gx, gy, gz, dt, FILTER_BETA)
+        out.append(q.to_euler())
+    return out
+
+def per_sample_us(fn, samples, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(samples)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(samples) * 1e6
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    samples = make_samples(n)
+
+    ref, fast = run_reference(samples), run_fast(samples)
+    max_err = max(max(abs(a[0] - b[0]), abs(a[1] - b[1])) for a, b in zip(ref, fast))
+
+    before = per_sample_us(run_reference, samples)
+    after = per_sample_us(run_fast, samples)
+    print(f"samples:        {n}")
+    print(f"max |diff| deg: {max_err:.3g}")
+    print(f"Quaternion:     {before:.2f} us/sample")
+    print(f"FastQuaternion: {after:.2f} us/sample ({before / after:.2f}x)")
+
+if __name__ == "__main__":
+    main()
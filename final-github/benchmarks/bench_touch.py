@@ -0,0 +1,73 @@
+"""Touch coordinate mapping: the per-event branches PiTft.update() used to
+run vs the compiled TouchTransform, for every rotation/invertx/inverty/swapxy
+combination (16). Checks that both give the same screen position for a grid
+of raw points, then times them.
+
+Run from final-github/:  python -m benchmarks.bench_touch
+Exits with status 1 if any combination maps a point differently.
+"""
+import itertools
+import sys
+import time
+
+from touch_transform import TouchTransform
+
+def reference_map(rx, ry, rotation, invertx, inverty, swapxy):
+    """Original per-event position mapping from pigame.PiTft.update()."""
+    e = {"y": rx, "x": ry}
+    if rotation == 90:
+        e = {"x": e["x"], "y": 240 - e["y"]}
+    elif rotation == 270:
+        e = {"x": 320 - e["x"], "y": e["y"]}
+    else:
+        raise(Exception("PiTft rotation is unsupported"))
+    if invertx:
+        e = {"x": 320 - e["x"], "y": e["y"]}
+    if inverty:
+        e = {"y": 240 - e["y"], "x": e["x"]}
+    if swapxy:
+        e = {"x": e["y"], "y": e["x"]}
+    return e["x"], e["y"]
+
+def combinations():
+    return itertools.product((90, 270), (False, True), (False, True), (False, True))
+
+def raw_grid(step=8):
+    # Raw x runs along the screen's 240 px side, raw y along the 320 px one
+    return [(rx, ry) for rx in range(1, 241, step) for ry in range(1, 321, step)]
+
+def check(points):
+    """Combinations (as option tuples) where the two mappings disagree."""
+    bad = []
+    for opts in combinations():
+        t = TouchTransform.from_options(*opts)
+        if any(t.map(rx, ry) != reference_map(rx, ry, *opts) for rx, ry in points):
+            bad.append(opts)
+    return bad
+
+def per_point_ns(fn, points, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(points)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(points) * 1e9
+
+def main():
+    points = raw_grid()
+    bad = check(points)
+    opts = (90, True, False, True)
+    t = TouchTransform.from_options(*opts)
+    before = per_point_ns(lambda ps: [reference_map(rx, ry, *opts) for rx, ry in ps], points)
+    after = per_point_ns(lambda ps: [t.map(rx, ry) for rx, ry in ps], points)
+    batch = per_point_ns(t.map_points, points)
+    print(f"combinations:  16, {len(points)} points each")
+    print(f"mismatches:    {bad or 'none'}")
+    print(f"per-event:     {before:.0f} ns/point")
+    print(f"map():         {after:.0f} ns/point ({before / after:.2f}x)")
+    print(f"map_points():  {batch:.0f} ns/point ({before / batch:.2f}x)")
+    if bad:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
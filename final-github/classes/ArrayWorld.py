@@ -0,0 +1,121 @@
+import pygame
+from constants.global_var import *
+from classes.World import World
+from classes.Bullet import Bullet, BULLET_SIZE
+from classes.Enemy import Enemy, ENEMY_SIZE
+from utils.assets import assets
+from utils.entities import EntityStore
+
+class ArrayWorld(World):
+    """World with bullets and enemies in NumPy entity stores instead of
+    sprite groups (ENTITY_BACKEND = "numpy"). Same rules: enemies fall at
+    their own speed, bullets rise at BULLET_SPEED, a bullet kills the first
+    enemy it touches in spawn order (the sprite group's order) and scores
+    one point per step with any kill. Only the player is still a sprite.
+    benchmarks/bench_parity.py checks that both backends play the same game. With PIXEL_COLLISIONS, rect
+    overlaps are confirmed against the cached image masks, as SpatialHash
+    does for sprites."""
+
+    def _init_entities(self, bullet_pool_size, enemy_pool_size):
+        self.bullets = EntityStore(bullet_pool_size, BULLET_SIZE)
+        self.enemies = EntityStore(enemy_pool_size, ENEMY_SIZE)
+        self.bullet_image = Bullet.load_image()
+        self.enemy_image = Enemy.load_image()
+        self.bullet_mask = assets.mask(self.bullet_image)
+        self.enemy_mask = assets.mask(self.enemy_image)
+        self.screen_rect = pygame.Rect(0, 0, W, H)
+        self.rect_tests = 0
+        self.mask_tests = 0
+        self.hits = 0
+        # Same keys as SpatialHash; every rect test here is a brute-force one
+        self.last_frame = {"rect_tests": 0, "mask_tests": 0, "naive": 0, "hits": 0}
+
+    def clear_enemies(self):
+        self.enemies.clear()
+
+    def fire(self):
+        rect = self.player.rect
+        return self.bullets.spawn(rect.centerx - BULLET_SIZE[0] // 2, rect.top - BULLET_SIZE[1],
+                                  vy=-BULLET_SPEED)
+
+    def spawn_enemy(self, x=None, speed=ENEMY_SPEED):
+        """Returns the enemy's slot, or None if the store is full."""
+        if x is None:
+            x = Enemy.spawn_pos()[0]
+        return self.enemies.spawn(x, -ENEMY_SIZE[1], vy=speed)
+
+    def begin_frame(self):
+        self.last_frame = {"rect_tests": self.rect_tests, "mask_tests": self.mask_tests,
+                           "naive": self.rect_tests, "hits": self.hits}
+        self.rect_tests = self.mask_tests = self.hits = 0
+
+    def _mask_hit(self, mask, x, y, other, ox, oy):
+        self.mask_tests += 1
+        return mask.overlap(other, (ox - x, oy - y)) is not None
+
+    def update_step(self, roll, pitch):
+        self.sim_steps += 1
+        self.sim_time += self.timestep.dt
+        if self.spawner is not None:
+            for x, speed in self.spawner.due(self.sim_time):
+                self.spawn_enemy(x, speed)
+
+        self.player.update(roll, pitch, self.timestep.dt)
+        self.bullets.step()
+        self.enemies.step()
+        self.bullets.cull(self.screen_rect)
+        self.enemies.cull(self.screen_rect)
+
+    def collide_step(self):
+        enemies, bullets = self.enemies, self.bullets
+        self.rect_tests += len(enemies) * len(bullets) + len(enemies)
+        ei, bj = enemies.overlap_pairs(bullets)
+        if len(ei):
+            # Like pygame.sprite.groupcollide: in enemy order, each enemy takes
+            # every bullet touching it that an earlier enemy didn't already take
+            spent = set()
+            killed = []
+            for i, j in zip(ei.tolist(), bj.tolist()):
+                if j in spent:
+                    continue
+                if not PIXEL_COLLISIONS or self._mask_hit(
+                        self.enemy_mask, int(enemies.x[i]), int(enemies.y[i]),
+                        self.bullet_mask, int(bullets.x[j]), int(bullets.y[j])):
+                    spent.add(j)
+                    self.hits += 1
+                    if not killed or killed[-1] != i:
+                        killed.append(i)
+            if killed:
+                self.enemies.kill(killed)
+                self.bullets.kill(list(spent))
+                self.score += 1
+        rect = self.player.rect
+        touching = enemies.overlap_rect(rect).tolist()
+        if PIXEL_COLLISIONS:
+            mask = self.player.mask
+            touching = [i for i in touching if self._mask_hit(
+                mask, rect.x, rect.y, self.enemy_mask, int(enemies.x[i]), int(enemies.y[i]))]
+        self.hits += len(touching)
+        return len(touching) > 0
+
+    def draw(self, renderer, hud):
+        alpha = self.timestep.alpha
+        self.player.interpolate(alpha)
+        renderer.begin_frame()
+        # Erase every layer before drawing any, so nothing drawn is erased
+        renderer.clear_entities(self.enemies)
+        renderer.clear_entities(self.bullets)
+        renderer.draw_group(self.all_sprites)
+        renderer.draw_entities(self.bullets, self.bullet_image, alpha)
+        renderer.draw_entities(self.enemies, self.enemy_image, alpha)
+        renderer.draw_hud(hud.render(self.score), (10, 10))
+
+    def stats(self):
+        return {
+            "bullets": self.bullets.stats(),
+            "enemies": self.enemies.stats(),
+            "collision": dict(self.last_frame),
+            "sim_steps": self.sim_steps,
+            "spawner": self.spawner.stats() if self.spawner is not None else None,
+            "dropped_steps": self.timestep.dropped_steps,
+        }
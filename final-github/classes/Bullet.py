@@ -1,24 +1,42 @@
 import pygame
 from constants.global_var import *
 from constants.global_var import PLAY_AREA, BULLET_SPEED, RED
+from utils.assets import assets
+from utils.pool import PooledSprite
+from utils.timestep import Interpolated
 
-class Bullet(pygame.sprite.Sprite):
+BULLET_SIZE = (4, 10)
+
+class Bullet(PooledSprite, Interpolated, pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
         # generate bullet under enemy
         # self.rect = pygame.Rect(x - 2, y, 4, 10)
         # self.alive = True
-        self.image = pygame.Surface((4, 10))
-        self.image.fill((200, 0, 0))
+        self.image = Bullet.load_image()
+        self.mask = assets.mask(self.image)
         self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.bottom = y
+        self.reset(x, y)
         
         self.speed = -8
 
+    def reset(self, x, y):
+        # Reuse this instance for a new shot fired from (x, y)
+        self.rect.centerx = x
+        self.rect.bottom = y
+        self.x = self.rect.x
+        self.y = self.rect.y
+        self.snap()
+
+    @staticmethod
+    def load_image():
+        return assets.solid(BULLET_SIZE, RED)
+
     def update(self):
-        # bullet go up
-        self.rect.y -= BULLET_SPEED
+        # bullet go up, one fixed simulation step
+        self.step_begin()
+        self.y -= BULLET_SPEED
+        self.step_end()
         # out of area then delete
         if self.rect.top > PLAY_AREA.bottom:
             self.alive = False
@@ -2,29 +2,47 @@ import pygame
 import os
 import random
 from constants.global_var import *
+from utils.assets import assets
+from utils.pool import PooledSprite
+from utils.timestep import Interpolated
 
 score = 0
 
-class Enemy(pygame.sprite.Sprite):
+ENEMY_IMAGE = os.path.join("assets", "enemy_1_1.png")
+ENEMY_SIZE  = (30, 30)
+
+class Enemy(PooledSprite, Interpolated, pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
         
-        asset_path = os.path.join("assets", "enemy_1_1.png")
-        
-        if os.path.exists(asset_path):
-            self.image = pygame.image.load(asset_path).convert_alpha()
-            # Optional: Resize if image is too big
-            self.image = pygame.transform.scale(self.image, (30, 30))
-        else:
-            # Fallback if image missing
-            self.image = pygame.Surface((30, 30))
-            self.image.fill(RED)
+        # Shared, already converted and scaled surface
+        self.image = Enemy.load_image()
+        self.mask = assets.mask(self.image)
             
         self.rect = self.image.get_rect()
-        self.rect.x = random.randint(0, W - self.rect.width)
-        self.rect.y = -self.rect.height # Start just above screen
+        # Parked at (0, 0): the pool builds these up front, and a random
+        # position here would make the pool size shift every later spawn
+        self.reset(0, 0)
+
+    @staticmethod
+    def spawn_pos():
+        # Random column, just above screen
+        return random.randint(0, W - ENEMY_SIZE[0]), -ENEMY_SIZE[1]
+
+    def reset(self, x, y, speed=ENEMY_SPEED):
+        self.x = x
+        self.y = y
+        self.speed = speed
+        self.snap()
+
+    @staticmethod
+    def load_image():
+        return assets.image(ENEMY_IMAGE, ENEMY_SIZE)
 
     def update(self):
-        self.rect.y += ENEMY_SPEED
+        # One fixed simulation step
+        self.step_begin()
+        self.y += self.speed
+        self.step_end()
         if self.rect.top > H:
             self.kill()
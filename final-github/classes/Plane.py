@@ -1,19 +1,27 @@
 import pygame
 from constants.global_var import *
+from utils.assets import assets
+from utils.timestep import Interpolated
 
-class Plane(pygame.sprite.Sprite):
+class Plane(Interpolated, pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
-        # Create a simple triangle representation
-        self.image = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.polygon(self.image, YELLOW, [(15, 0), (0, 30), (30, 30)])
+        # Simple triangle representation (shared surface)
+        self.image = Plane.load_image()
+        self.mask = assets.mask(self.image)
         self.rect = self.image.get_rect(center=(W//2, H//2))
         
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
+        self.snap()
+
+    @staticmethod
+    def load_image():
+        return assets.polygon((30, 30), YELLOW, [(15, 0), (0, 30), (30, 30)])
 
     def update(self, roll, pitch, dt):
-        # Move based on roll/pitch
+        # Move based on roll/pitch, dt is the fixed simulation step
+        self.step_begin()
         vx = roll * PLANE_SPEED_SCALE
         vy = pitch * PLANE_SPEED_SCALE
         
@@ -24,5 +32,4 @@ class Plane(pygame.sprite.Sprite):
         self.x = max(0, min(W - self.rect.width, self.x))
         self.y = max(0, min(H - self.rect.height, self.y))
         
-        self.rect.x = int(self.x)
-        self.rect.y = int(self.rect.y)
+        self.step_end()
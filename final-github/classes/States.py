@@ -0,0 +1,207 @@
+import pygame
+from constants.global_var import *
+from utils.assets import texts
+from utils.text import ScoreHUD
+
+class Context:
+    """Objects shared by every state."""
+    def __init__(self, screen, renderer, world, imu, prof, font_big, font_small, latency):
+        self.screen = screen
+        self.renderer = renderer
+        self.world = world
+        self.imu = imu
+        self.prof = prof
+        self.latency = latency
+        self.font_big = font_big
+        self.font_small = font_small
+        self.score_hud = ScoreHUD(font_small)
+        self.running = True
+
+class State:
+    """One screen of the game. update() must never block: anything that
+    takes time is done with StateMachine.change_after()."""
+    name = None
+
+    def __init__(self, machine, ctx):
+        self.machine = machine
+        self.ctx = ctx
+
+    def enter(self, prev):
+        pass
+
+    def exit(self):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def shoot(self):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def draw(self):
+        pass
+
+class StateMachine:
+    def __init__(self):
+        self.states = {}
+        self.current = None
+        self._timed = None      # (state name, seconds left)
+
+    def add(self, state):
+        self.states[state.name] = state
+
+    def change(self, name):
+        prev = self.current
+        self._timed = None
+        if prev is not None:
+            prev.exit()
+        self.current = self.states[name]
+        self.current.enter(prev.name if prev is not None else None)
+
+    def change_after(self, name, seconds):
+        """Timed transition, counted down in update() so the loop keeps running."""
+        self._timed = (name, seconds)
+
+    def handle_event(self, event):
+        self.current.handle_event(event)
+
+    def shoot(self):
+        self.current.shoot()
+
+    def update(self, dt):
+        if self._timed is not None:
+            name, left = self._timed
+            left -= dt
+            if left <= 0:
+                self.change(name)
+            else:
+                self._timed = (name, left)
+        self.current.update(dt)
+
+    def draw(self):
+        self.current.draw()
+
+# ====== Helper Function to Draw Menu ======
+def draw_menu(screen, background, font_big, font_small):
+    screen.blit(background, (0, 0))
+    
+    # Draw Title
+    title = texts.text(font_big, "IMU PLANE", (255, 255, 0))
+    screen.blit(title, (W//2 - title.get_width()//2, 40))
+
+    # Define Buttons
+    start_rect = pygame.Rect(W//2 - 60, 100, 120, 50)
+    quit_rect  = pygame.Rect(W//2 - 60, 180, 120, 50)
+
+    # Draw Buttons
+    pygame.draw.rect(screen, (0, 200, 0), start_rect) # Green
+    pygame.draw.rect(screen, (200, 0, 0), quit_rect)  # Red
+
+    # Draw Text
+    txt_start = texts.text(font_small, "START", (255, 255, 255))
+    txt_quit  = texts.text(font_small, "QUIT",  (255, 255, 255))
+    
+    screen.blit(txt_start, txt_start.get_rect(center=start_rect.center))
+    screen.blit(txt_quit, txt_quit.get_rect(center=quit_rect.center))
+
+    return start_rect, quit_rect
+
+def draw_banner(ctx, text, color):
+    # Centered message over whatever is on screen, pushed with one full flip
+    msg = texts.text(ctx.font_big, text, color)
+    ctx.screen.blit(msg, (W//2 - msg.get_width()//2, H//2))
+    ctx.renderer.invalidate()
+
+class MenuState(State):
+    name = "menu"
+
+    def enter(self, prev):
+        # Menu is static: only redraw when this is set
+        self.dirty = True
+        self.start_rect = pygame.Rect(0, 0, 0, 0)
+        self.quit_rect = pygame.Rect(0, 0, 0, 0)
+
+    def handle_event(self, event):
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return
+        # event.pos, not mouse.get_pos(): replayed events don't move the cursor
+        x, y = event.pos
+        if self.start_rect.collidepoint(x, y):
+            print("Start Game!")
+            self.machine.change("playing")
+        elif self.quit_rect.collidepoint(x, y):
+            self.ctx.running = False
+
+    def draw(self):
+        ctx = self.ctx
+        if self.dirty or not ctx.renderer.dirty:
+            self.start_rect, self.quit_rect = draw_menu(ctx.screen, ctx.renderer.background,
+                                                       ctx.font_big, ctx.font_small)
+            ctx.renderer.invalidate()
+            self.dirty = False
+
+class PlayingState(State):
+    name = "playing"
+
+    def enter(self, prev):
+        if prev == "paused":
+            # Don't simulate the time spent paused
+            self.ctx.world.timestep.reset()
+        else:
+            self.ctx.world.reset()
+            # The menu doesn't read the IMU; don't fly on its backlog
+            self.ctx.imu.resync()
+        self.ctx.renderer.clear_screen()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == PAUSE_KEY:
+            self.machine.change("paused")
+
+    def shoot(self):
+        self.ctx.world.fire()
+
+    def update(self, dt):
+        ctx = self.ctx
+        # 1. Hardware
+        roll, pitch = ctx.imu.update(dt)
+        ctx.latency.consumed("imu", getattr(ctx.imu, "sample_time", None))
+        ctx.prof.mark("imu")
+        ctx.renderer.scroll(dt)
+
+        # 2. Fixed-step simulation + collisions
+        if ctx.world.simulate(dt, roll, pitch, ctx.prof):
+            print("Crashed!")
+            self.machine.change("game_over")
+
+    def draw(self):
+        ctx = self.ctx
+        ctx.world.draw(ctx.renderer, ctx.score_hud)
+        ctx.prof.draw_overlay(ctx.renderer)
+
+class GameOverState(State):
+    name = "game_over"
+
+    def enter(self, prev):
+        # Show Game Over briefly, then back to the menu without blocking
+        draw_banner(self.ctx, "GAME OVER", RED)
+        self.machine.change_after("menu", GAME_OVER_SECONDS)
+
+    def update(self, dt):
+        # Keep the orientation filter fed while the banner is up
+        self.ctx.imu.update(dt)
+
+class PausedState(State):
+    name = "paused"
+
+    def enter(self, prev):
+        draw_banner(self.ctx, "PAUSED", WHITE)
+
+    def handle_event(self, event):
+        if (event.type == pygame.KEYDOWN and event.key == PAUSE_KEY) or event.type == pygame.MOUSEBUTTONDOWN:
+            self.machine.change("playing")
+
+    def update(self, dt):
+        self.ctx.imu.update(dt)
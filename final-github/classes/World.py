@@ -0,0 +1,134 @@
+import pygame
+from constants.global_var import *
+from classes.Plane import Plane
+from classes.Bullet import Bullet
+from classes.Enemy import Enemy, ENEMY_SIZE
+from utils.pool import SpritePool
+from utils.collision import SpatialHash
+from utils.timestep import FixedTimestep
+from utils.waves import SpawnScheduler, load_waves
+
+class World:
+    """Everything that makes up one game session: sprites, pools, the
+    fixed-step simulation and collisions. main() and the headless benchmark
+    drive the same object."""
+
+    def __init__(self, bullet_pool_size=BULLET_POOL_SIZE, enemy_pool_size=ENEMY_POOL_SIZE,
+                 waves=WAVE_FILE):
+        """waves: wave file path, an already loaded definition, or None for
+        no scheduled spawns (callers spawn_enemy() themselves)."""
+        self.spawner = None
+        if waves is not None:
+            definition = load_waves(waves) if isinstance(waves, str) else waves
+            # Stress files ask for more enemies than the default pool holds
+            enemy_pool_size = max(enemy_pool_size, definition.get("max_enemies", 0))
+            self.spawner = SpawnScheduler(definition, ENEMY_SIZE[0])
+
+        # RenderUpdates reports changed rects for the dirty-rect renderer
+        self.all_sprites = pygame.sprite.RenderUpdates()
+        self.player = Plane()
+        self.all_sprites.add(self.player)
+        self._init_entities(bullet_pool_size, enemy_pool_size)
+        self.timestep = FixedTimestep()
+
+        self.score = 0
+        self.sim_steps = 0
+        self.sim_time = 0.0
+
+    def _init_entities(self, bullet_pool_size, enemy_pool_size):
+        self.bullets = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        # Preallocated sprites; steady-state play never creates new ones
+        self.bullet_pool = SpritePool(lambda: Bullet(0, 0), bullet_pool_size)
+        self.enemy_pool  = SpritePool(Enemy, enemy_pool_size)
+        self.broadphase  = SpatialHash()
+
+    def reset(self):
+        self.score = 0
+        self.sim_time = 0.0
+        self.timestep.reset()
+        if self.spawner is not None:
+            self.spawner.reset()
+        self.clear_enemies()
+
+    def clear_enemies(self):
+        # Clear enemies from previous run
+        for e in self.enemies: e.kill()
+
+    def fire(self):
+        return self.bullet_pool.acquire(self.player.rect.centerx, self.player.rect.top,
+                                        self.all_sprites, self.bullets)
+
+    def spawn_enemy(self, x=None, speed=ENEMY_SPEED):
+        """Returns the enemy, or None if the pool is exhausted."""
+        if x is None:
+            x = Enemy.spawn_pos()[0]
+        enemy = self.enemy_pool.acquire(x, -ENEMY_SIZE[1], self.all_sprites, self.enemies)
+        if enemy is not None:
+            enemy.speed = speed
+        return enemy
+
+    def update_step(self, roll, pitch):
+        """Move everything by one fixed simulation step."""
+        self.sim_steps += 1
+        self.sim_time += self.timestep.dt
+        if self.spawner is not None:
+            for x, speed in self.spawner.due(self.sim_time):
+                self.spawn_enemy(x, speed)
+
+        self.player.update(roll, pitch, self.timestep.dt)
+        self.bullets.update()
+        self.enemies.update()
+
+    def collide_step(self):
+        """Resolve collisions for the current step. Returns True on a crash."""
+        if self.broadphase.groupcollide(self.enemies, self.bullets, True, True):
+            self.score += 1
+        return bool(self.broadphase.spritecollide(self.player, self.enemies, False))
+
+    def begin_frame(self):
+        self.broadphase.begin_frame()
+
+    def simulate(self, frame_dt, roll, pitch, prof=None):
+        """Run as many fixed steps as frame_dt allows. Returns True on a crash.
+        prof, if given, is charged the update and collision phases."""
+        self.begin_frame()
+        for _ in range(self.timestep.advance(frame_dt)):
+            self.update_step(roll, pitch)
+            if prof is not None: prof.mark("update")
+            crashed = self.collide_step()
+            if prof is not None: prof.mark("collision")
+            if crashed:
+                return True
+        return False
+
+    def draw(self, renderer, hud):
+        # Draw between the last two simulation steps
+        alpha = self.timestep.alpha
+        for sprite in self.all_sprites:
+            sprite.interpolate(alpha)
+        renderer.begin_frame()
+        renderer.draw_group(self.all_sprites)
+
+        # Draw Score (re-rasterized only when it changes)
+        renderer.draw_hud(hud.render(self.score), (10, 10))
+
+    def stats(self):
+        return {
+            "bullets": self.bullet_pool.stats(),
+            "enemies": self.enemy_pool.stats(),
+            "collision": self.broadphase.stats(),
+            "sim_steps": self.sim_steps,
+            "spawner": self.spawner.stats() if self.spawner is not None else None,
+            "dropped_steps": self.timestep.dropped_steps,
+        }
+
+def create_world(backend=ENTITY_BACKEND, **kwargs):
+    """World for the given entity backend: "sprites" or "numpy"."""
+    if backend == "numpy":
+        # Imported here: the sprite backend must not need numpy
+        from classes.ArrayWorld import ArrayWorld
+        return ArrayWorld(**kwargs)
+    if backend != "sprites":
+        raise ValueError(f"Unknown entity backend {backend!r}, expected 'sprites' or 'numpy'")
+    return World(**kwargs)
@@ -5,6 +5,18 @@ USE_PITFT            = True     # True: run on piTFT; False: run on monitor
 TIMEOUT_SECONDS      = 300      
 HIDE_CURSOR_ON_PITFT = True     
 BAILOUT_GPIO         = 27       
+FB_DEVICE            = "/dev/fb0"   # PiTFT framebuffer (fb1 on older kernels with HDMI fb0)
+FB_PRESENTER         = False    # True: write frames into FB_DEVICE ourselves instead of SDL fbcon (env FB_PRESENTER=on)
+SHOOT_GPIO           = 22
+GPIO_BACKEND         = "auto"   # auto (RPi.GPIO, else stub) / real / stub
+IMU_BACKEND          = "auto"   # auto (real, else mock) / real / mock / replay
+IMU_REPLAY_FILE      = "imu_log.csv"      # t,ax,ay,az,gx,gy,gz rows (t in s) for the replay backend
+CALIBRATION_FILE     = "gyro_calibration.json"
+SESSION_RECORD       = None     # Path: record inputs of this run (env SESSION_RECORD)
+SESSION_REPLAY       = None     # Path: replay a recorded run instead of live input (env SESSION_REPLAY)
+SESSION_REPLAY_FAST  = True     # Replay without waiting for the frame clock
+CALIBRATION_MAX_AGE_HOURS  = 24 * 7   # Recalibrate when the cached offsets are older
+CALIBRATION_MAX_TEMP_DELTA = 10.0     # ... or taken more than this many C away
 
 # ====== Dimensions ======
 W, H       = 320, 240
@@ -20,18 +32,57 @@ RED   = (200, 0, 0)
 GREEN = (0, 200, 0)
 BLACK = (0, 0, 0)
 YELLOW = (255, 255, 100)
+BG_COLOR = (0, 0, 30)
+
+# ====== Background ======
+BG_STARS        = 30     # Pre-rendered once, so free per frame
+BG_BUTTON_BAR   = False  # Draw BUTTON_BAR into the background
+BG_SCROLL_SPEED = 0.0    # px/s; > 0 scrolls the starfield (forces full-screen pushes)
 
 # ====== Game Settings ======
-ENEMY_WIDTH     = 4
-ENEMY_MIN_H     = 20
-ENEMY_MAX_H     = 70
-INITIAL_ENEMIES = 4
-SPAWN_TIME      = 1.0   
 BULLET_SPEED    = 4
 BULLET_INTERVAL = 2.0
 FPS  			= 60
 PLANE_SPEED_SCALE = 2.0
 FILTER_BETA = 0.02
 # BULLET_SPEED = 5
-ENEMY_SPEED = 2
-SPAWN_RATE = 60  # Frames between spawns
+ENEMY_SPEED = 2   # Default px per simulation step; waves can override
+WAVE_FILE = "waves/default.json"  # Timed spawn waves (env WAVE_FILE, e.g. waves/stress.json)
+GAME_OVER_SECONDS = 2.0  # How long the GAME OVER banner stays up
+PAUSE_KEY = pygame.K_p
+
+# ====== Performance ======
+DIRTY_RENDERING  = True  # True: push only changed rects; False: full flip every frame
+ASSET_CACHE_SIZE = 32    # Max cached surfaces (LRU)
+TEXT_CACHE_SIZE  = 64    # Max cached text renders (LRU)
+SCORE_DIGIT_ATLAS = True # Compose the score from pre-rendered digit glyphs
+BULLET_POOL_SIZE = 32    # Max bullets on screen at once
+ENEMY_POOL_SIZE  = 24    # Max enemies on screen at once
+ENTITY_BACKEND   = "sprites"  # sprites / numpy (arrays + Surface.blits; env ENTITY_BACKEND)
+IMU_THREADED     = True  # True: sample IMU in a background thread; False: poll once per frame
+IMU_SAMPLE_HZ    = 200   # Background sampler rate
+IMU_FIFO         = False # True: batch samples in the sensor FIFO and drain once per frame
+IMU_FIFO_HZ      = 208   # FIFO batch rate (26, 52, 104, 208, 416 or 833)
+IMU_FIFO_MAX_GAP = 4     # Sample periods; a longer gap between FIFO samples restarts integration
+IMU_CLOCK_SLEW   = 0.1   # s/s the FIFO clock offset estimate may rise; above the sensor clock error
+SPATIAL_CELL     = 32    # Broadphase grid cell size in pixels
+PIXEL_COLLISIONS = True  # Confirm rect hits with the sprites' cached masks
+SIM_HZ           = 60    # Fixed simulation rate, independent of the render rate
+MAX_SIM_STEPS    = 5     # Max catch-up steps per rendered frame
+PROFILER_ENABLED = False # Per-phase frame timing (zero cost when False)
+PROFILER_OVERLAY = True  # Draw FPS / worst frame / phase bars on screen
+PROFILER_FRAMES  = 240   # Ring buffer length in frames
+PROFILER_DUMP    = "profile.jsonl"  # Periodic summary file (None: off)
+PROFILER_DUMP_SECONDS = 5.0
+GPIO_QUEUE_SIZE  = 64     # Button edges buffered between frames
+GPIO_BOUNCE_MS   = 150
+LATENCY_TRACE    = False   # Input-to-present latency histograms (env LATENCY_TRACE=on)
+LATENCY_BIN_MS   = 1.0
+LATENCY_MAX_MS   = 250
+LATENCY_DUMP     = "latency.json"
+TOUCH_COALESCE   = True  # Coalesce touchscreen motion, deliver at most one move per frame
+ONLINE_BIAS      = True  # Refine gyro offsets while the board is at rest
+BIAS_STILL_GYRO  = 0.05  # rad/s: max |gyro - bias| that still counts as at rest
+BIAS_STILL_ACCEL = 0.5   # m/s^2: max deviation of |accel| from 1 g at rest
+BIAS_SETTLE_SECONDS = 0.5  # Rest time before the estimate starts moving
+BIAS_TAU_SECONDS = 5.0   # Time constant of the bias estimate
@@ -1,249 +1,217 @@
+import time
+_T0 = time.perf_counter()   # startup report starts here
 import os
 import sys
-import time
 import random
-from time import sleep
 
 import pygame
-import pigame # Make sure pigame.py is in the folder
 from pygame.locals import *
 
 # Custom modules
 from constants.global_var import *
 from utils.hardware import IMUHandler
+from utils.assets import assets
+from utils.render import Renderer
 from classes.Plane import Plane
 from classes.Bullet import Bullet
 from classes.Enemy import Enemy
+from classes.World import create_world
+from utils.profiler import FrameProfiler, StartupTimer
+from utils.session import SessionRecorder, SessionPlayer, RecordingIMU
+from utils.gpio_input import GPIOInput, StubGPIOBackend
+from utils.latency import LatencyTracer
+from classes.States import (Context, StateMachine, MenuState, PlayingState,
+                            GameOverState, PausedState)
 
 # ====== Switches ======
-USE_PITFT = True
+USE_PITFT = os.getenv("USE_PITFT") != "off"   # USE_PITFT=off: run on a desktop monitor
 TIMEOUT_SECONDS = 300
 HIDE_CURSOR_ON_PITFT = True
-BAILOUT_GPIO = 27
-SHOOT_GPIO = 22
 # ====== PiTFT preparation ======
-def setup_env_for_pitft():
-    os.putenv("SDL_VIDEODRIVER", "fbcon")
-    os.putenv("SDL_FBDEV", "/dev/fb0") # Ensure this is fb0 or fb1 depending on your Pi
+def setup_env_for_pitft(fb_presenter=False):
+    # With our own framebuffer presenter SDL only needs an off-screen surface
+    os.putenv("SDL_VIDEODRIVER", "dummy" if fb_presenter else "fbcon")
+    os.putenv("SDL_FBDEV", FB_DEVICE)
     os.putenv("SDL_MOUSEDRV", "dummy")
     os.putenv("SDL_MOUSEDEV", "/dev/null")
     os.putenv("DISPLAY", "")
 
-# ====== Bail-out button (GPIO) ======
-try:
-    import RPi.GPIO as GPIO
-    HAVE_GPIO = True
-except Exception:
-    GPIO = None
-    HAVE_GPIO = False
-
-_bailout_triggered = False
-_shoot_triggered   = False
-
-def _bailout_cb(channel):
-    global _bailout_triggered
-    print("[GPIO] Bailout button pressed")
-    _bailout_triggered = True
-
-def setup_bailout_button():
-    if not HAVE_GPIO:
-        return
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setup(BAILOUT_GPIO, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.add_event_detect(BAILOUT_GPIO, GPIO.FALLING, callback=_bailout_cb, bouncetime=150)
-
-def cleanup_bailout_button():
-    if HAVE_GPIO:
-        GPIO.cleanup()
-        
-def _shoot_cb(channel):
-    global _shoot_triggered
-    _shoot_triggered = True
-
-
-def setup_shoot_button():
-    if not HAVE_GPIO:
-        return
-
-    GPIO.setmode(GPIO.BCM)
-
-    GPIO.setup(SHOOT_GPIO, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.add_event_detect(SHOOT_GPIO,
-                          GPIO.FALLING,
-                          callback=_shoot_cb,
-                          bouncetime=150)
-
-# ====== Helper Function to Draw Menu ======
-def draw_menu(screen, font_big, font_small):
-    screen.fill((0, 0, 30)) 
-    
-    # Draw Title
-    title = font_big.render("IMU PLANE", True, (255, 255, 0))
-    screen.blit(title, (W//2 - title.get_width()//2, 40))
-
-    # Define Buttons
-    start_rect = pygame.Rect(W//2 - 60, 100, 120, 50)
-    quit_rect  = pygame.Rect(W//2 - 60, 180, 120, 50)
-
-    # Draw Buttons
-    pygame.draw.rect(screen, (0, 200, 0), start_rect) # Green
-    pygame.draw.rect(screen, (200, 0, 0), quit_rect)  # Red
-
-    # Draw Text
-    txt_start = font_small.render("START", True, (255, 255, 255))
-    txt_quit  = font_small.render("QUIT",  True, (255, 255, 255))
-    
-    screen.blit(txt_start, txt_start.get_rect(center=start_rect.center))
-    screen.blit(txt_quit, txt_quit.get_rect(center=quit_rect.center))
-
-    return start_rect, quit_rect
-
 def main():
-    global _bailout_triggered, _shoot_triggered
-
+    startup = StartupTimer(_T0)
+    startup.mark("imports")
+
+    # Session record/replay: the RNG seed is part of the log
+    record_path = os.getenv("SESSION_RECORD", SESSION_RECORD)
+    replay_path = os.getenv("SESSION_REPLAY", SESSION_REPLAY)
+    recorder = player = None
+    if replay_path:
+        player = SessionPlayer(replay_path)
+        seed = player.seed
+        print(f"[Session] Replaying {replay_path}")
+    else:
+        seed = int.from_bytes(os.urandom(4), "little")
+        if record_path:
+            recorder = SessionRecorder(record_path, seed)
+            print(f"[Session] Recording to {record_path}")
+    random.seed(seed)
+
+    fb_presenter = USE_PITFT and os.getenv("FB_PRESENTER", "on" if FB_PRESENTER else "off") == "on"
     if USE_PITFT:
-        setup_env_for_pitft()
+        setup_env_for_pitft(fb_presenter)
 
     pygame.init()   
+    startup.mark("pygame_init")
 
     if USE_PITFT and HIDE_CURSOR_ON_PITFT:
         pygame.mouse.set_visible(False)
     
     # Initialize PiTFT (Correction Helper)
-    pitft = pigame.PiTft()
+    # Imported here: pigame needs evdev, which desktop runs don't have
+    pitft = None
+    if player is not None:
+        pitft = player.touch
+    elif USE_PITFT:
+        import pigame # Make sure pigame.py is in the folder
+        # Buttons belong to GPIOInput; PiTft must not claim pins 22/27 too
+        pitft = pigame.PiTft(allow_gpio=False, coalesce=TOUCH_COALESCE)
+    startup.mark("touchscreen")
     
     screen = pygame.display.set_mode((W, H))
     pygame.display.set_caption("Enemy Tapper Integrated")
     clock = pygame.time.Clock()
-
-    # Initialize Hardware
-    imu = IMUHandler()
-    setup_bailout_button()
-    setup_shoot_button()
+    startup.mark("display")
+
+    presenter = None
+    if fb_presenter:
+        from utils.framebuffer import FramebufferPresenter
+        presenter = FramebufferPresenter(screen)
+    renderer = Renderer(screen, presenter=presenter)
+
+    # Load and convert all sprite surfaces once, before the first spawn
+    assets.preload([Plane.load_image, Bullet.load_image, Enemy.load_image])
+    startup.mark("assets")
+
+    # Initialize Hardware (gyro calibration runs in the background if not cached)
+    if player is not None:
+        imu = player.imu
+    else:
+        imu = IMUHandler()
+        if recorder is not None:
+            imu = RecordingIMU(imu, recorder)
+    # Shoot (22) and bailout (27) edges, queued by the GPIO thread per frame
+    gpio = GPIOInput(backend=StubGPIOBackend() if player is not None else None)
+    startup.mark("hardware")
     # Fonts
     font_big   = pygame.font.Font(None, 52)
     font_small = pygame.font.Font(None, 28)
 
-    # Game State Variables
-    mode = "menu"   # Start in menu
-    score = 0
-    frame_count = 0
-    running = True
-
-    # Initialize Sprites
-    all_sprites = pygame.sprite.Group()
-    bullets = pygame.sprite.Group()
-    enemies = pygame.sprite.Group()
-    
-    player = Plane()
-    all_sprites.add(player)
+    # Sprites, pools, collisions and the fixed-step simulation
+    world = create_world(os.getenv("ENTITY_BACKEND", ENTITY_BACKEND),
+                         waves=os.getenv("WAVE_FILE", WAVE_FILE))
+    prof = FrameProfiler()
+    latency = LatencyTracer(os.getenv("LATENCY_TRACE", "on" if LATENCY_TRACE else "off") == "on")
 
-    # Define button rects initially (will be updated in loop)
-    start_rect = pygame.Rect(0,0,0,0)
-    quit_rect = pygame.Rect(0,0,0,0)
+    # Game states: menu -> playing <-> paused, playing -> game_over -> menu
+    ctx = Context(screen, renderer, world, imu, prof, font_big, font_small, latency)
+    machine = StateMachine()
+    for state in (MenuState, PlayingState, GameOverState, PausedState):
+        machine.add(state(machine, ctx))
+    machine.change("menu")   # Start in menu
 
     # ================= MAIN LOOP =================
-    while running:
+    while ctx.running:
+        prof.begin_frame()
+
+        if player is not None:
+            # Load this frame's recorded input; stop at the end of the log
+            if not player.next_frame():
+                break
+            for _ in range(player.shoots):
+                gpio.push("shoot")
+
         # 1. ALWAYS Update PiTFT Input First
-        if USE_PITFT:
+        if pitft is not None:
             pitft.update()
+        prof.mark("touch")
 
         # 2. Check Bailout
-        if _bailout_triggered:
-            running = False
+        buttons = gpio.poll()
+        if buttons.count("bailout"):
+            print("[GPIO] Bailout button pressed")
             break
 
-        dt = clock.tick(FPS) / 1000.0
+        if player is not None:
+            clock.tick(0 if SESSION_REPLAY_FAST else FPS)
+            dt = player.dt
+        else:
+            dt = clock.tick(FPS) / 1000.0
+        if recorder is not None:
+            recorder.frame(dt)
+        prof.mark("tick")
         
         # ================= EVENT HANDLING =================
         for event in pygame.event.get():
+            if recorder is not None:
+                recorder.event(event)
+            if hasattr(event, "t"):
+                # Touch from pigame, stamped with the evdev capture time
+                latency.consumed("touch", latency.from_wall(event.t))
             if event.type == pygame.QUIT:
-                running = False
-            
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                x, y = pygame.mouse.get_pos()
-                
-                if mode == "menu":
-                    # Check Menu Buttons
-                    if start_rect.collidepoint(x, y):
-                        print("Start Game!")
-                        mode = "game"
-                        score = 0
-                        # Clear enemies from previous run
-                        for e in enemies: e.kill()
-                        
-                    elif quit_rect.collidepoint(x, y):
-                        running = False
-                        
-                # elif mode == "game":
-                    # Fire Bullet
-                    # if event.key == pygame.K_SPACE:
-                    #     b = Bullet(player.rect.centerx, player.rect.top)
-                    #     all_sprites.add(b)
-                    #    bullets.add(b)
-                
-            elif event.type == pygame.KEYDOWN:
+                ctx.running = False
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_q):
                 # Quit
-                if event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
-                    running = False
-                # --- FIRE BULLET LOGIC GOES HERE ---
-        if mode == "game" and _shoot_triggered:
-          b = Bullet(player.rect.centerx, player.rect.top)
-          all_sprites.add(b)
-          bullets.add(b)
-          _shoot_triggered = False
+                ctx.running = False
+            else:
+                machine.handle_event(event)
+
+        # Fire Bullet (only the playing state acts on it), one per press
+        for name, t in buttons.events:
+            if name != "shoot":
+                continue
+            if recorder is not None:
+                recorder.shoot()
+            machine.shoot()
+            latency.consumed("button", t)
+        prof.mark("input")
 
         # ================= UPDATE & DRAW =================
-        
-        if mode == "menu":
-            # Just draw the menu
-            start_rect, quit_rect = draw_menu(screen, font_big, font_small)
-            pygame.display.flip()
-
-        elif mode == "game":
-            frame_count += 1
-            
-            # 1. Hardware
-            roll, pitch = imu.update(dt)
-
-            # 2. Game Logic
-            if frame_count % SPAWN_RATE == 0:
-                e = Enemy()
-                all_sprites.add(e)
-                enemies.add(e)
-
-            player.update(roll, pitch, dt)
-            bullets.update()
-            enemies.update()
-
-            # 3. Collisions
-            if pygame.sprite.groupcollide(enemies, bullets, True, True):
-                score += 1
-
-            if pygame.sprite.spritecollide(player, enemies, False):
-                print("Crashed!")
-                # Show Game Over briefly
-                msg = font_big.render("GAME OVER", True, RED)
-                screen.blit(msg, (W//2 - msg.get_width()//2, H//2))
-                pygame.display.flip()
-                sleep(2)
-                mode = "menu" # Return to menu
-                # Reset Player Position (Optional, depends on your Plane class)
-                # player.rect.center = (W//2, H - 50) 
-
-            # 4. Draw Game
-            screen.fill((0, 0, 30))
-            all_sprites.draw(screen)
-            
-            # Draw Score
-            f_score = font_small.render(f"Score: {score}", True, (255, 255, 0))
-            screen.blit(f_score, (10, 10))
-            
-            pygame.display.flip()
+        machine.update(dt)
+        machine.draw()
+        prof.mark("draw")
+        renderer.present()
+        latency.presented()
+        prof.mark("flip")
+
+        prof.end_frame()
+
+        if startup is not None:
+            # First frame is on screen: report and stop timing
+            startup.mark("first_frame")
+            print(f"[Startup] ms {startup.report()}")
+            startup = None
 
     # Cleanup
+    imu.stop()
+    if recorder is not None:
+        recorder.close()
+        print(f"[Session] Recorded {recorder.frames} frames")
+    if player is not None:
+        print(f"[Session] Replayed {player.frames} frames, score {world.score}")
+    print(f"[Assets] {assets.stats()}")
+    print(f"[World] {world.stats()}")
+    if USE_PITFT and player is None and TOUCH_COALESCE:
+        print(f"[Touch] {pitft.touch_stats()}")
+    if prof.enabled:
+        print(f"[Profiler] {prof.summary()}")
+    if latency.enabled:
+        print(f"[Latency] (n, p50, p95, max ms) {latency.summary()}")
+        latency.dump()
+    print(f"[GPIO] {gpio.stats()}")
+    if presenter is not None:
+        print(f"[Framebuffer] {presenter.stats()}")
+        presenter.close()
+    gpio.stop()
     pygame.quit()
-    cleanup_bailout_button()
     sys.exit()
 
 if __name__ == "__main__":
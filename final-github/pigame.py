@@ -1,7 +1,8 @@
 import pygame,pitft_touchscreen,os
+from touch_transform import TouchTransform
 defaultrot = os.getenv('PIGAME_ROT') or '90'
 support_gpio = True
-envmk = ['PIGAME_V2','PIGAME_INVERTX','PIGAME_INVERTY','PIGAME_SWAPXY','PIGAME_BTN1','PIGAME_BTN2','PIGAME_BTN3','PIGAME_BTN4']
+envmk = ['PIGAME_V2','PIGAME_INVERTX','PIGAME_INVERTY','PIGAME_SWAPXY','PIGAME_BTN1','PIGAME_BTN2','PIGAME_BTN3','PIGAME_BTN4','PIGAME_COALESCE','PIGAME_CAL']
 env = {}
 for i in envmk:
     env[i] = os.getenv(i)
@@ -11,20 +12,30 @@ except ImportError:
     support_gpio = False
 from pygame.locals import *
 class PiTft:
-    def __init__(self,rotation:int=-1,v2:bool=False if env['PIGAME_V2']=='off' else True,allow_gpio:bool=True,invertx:bool=True if env['PIGAME_INVERTX']=='on' else False,inverty:bool=True if env['PIGAME_INVERTY']=='on' else False,swapxy:bool=True if env['PIGAME_SWAPXY']=='on' else False,buttons=[False if env['PIGAME_BTN1']=='off' else True,False if env['PIGAME_BTN2']=='off' else True,False if env['PIGAME_BTN3']=='off' else True,False if env['PIGAME_BTN4']=='off' else True]):
+    def __init__(self,rotation:int=-1,v2:bool=False if env['PIGAME_V2']=='off' else True,allow_gpio:bool=True,invertx:bool=True if env['PIGAME_INVERTX']=='on' else False,inverty:bool=True if env['PIGAME_INVERTY']=='on' else False,swapxy:bool=True if env['PIGAME_SWAPXY']=='on' else False,buttons=[False if env['PIGAME_BTN1']=='off' else True,False if env['PIGAME_BTN2']=='off' else True,False if env['PIGAME_BTN3']=='off' else True,False if env['PIGAME_BTN4']=='off' else True],coalesce:bool=True if env['PIGAME_COALESCE']=='on' else False,calibration:str=env['PIGAME_CAL']):
         self.use_gpio = support_gpio and allow_gpio and not (os.getenv('PIGAME_GPIO') == 'off')
         if not self.use_gpio:
             buttons=[False,False,False,False]
         if rotation == -1:
             rotation = int(defaultrot)
-        self.pitft=pitft_touchscreen.pitft_touchscreen()
+        self.coalesce = coalesce
+        if coalesce:
+            self.pitft=pitft_touchscreen.TouchReader()
+        else:
+            self.pitft=pitft_touchscreen.pitft_touchscreen()
         self.pitft.button_down=False
         self.pitft.pigameapi=2
         self.pitft.pigamerotr=rotation
         self.invertx = invertx
         self.inverty = inverty
         self.swapxy = swapxy
-        self.cachedpos = [0,0]
+        self.cachedpos = (0,0)
+        self.cachedraw = [0,0]
+        # rotation/invert/swap (or a calibration file) compiled into one affine map
+        if calibration:
+            self.transform = TouchTransform.load(calibration)
+        else:
+            self.transform = TouchTransform.from_options(rotation,invertx,inverty,swapxy)
         self.__b1 = False
         self.__b2 = False
         self.__b3 = False
@@ -52,46 +63,65 @@ class PiTft:
         self.pitft.start()
     def update(self):
         """Add Touchscreen Events to PyGame event queue."""
+        if self.coalesce:
+            self._update_coalesced()
+            return
         while not self.pitft.queue_empty():
             for r in self.pitft.get_event():
-                e={"y":(r["x"] if r["x"] else self.cachedpos[0]),"x":(r["y"] if r["y"] else self.cachedpos[1])}
-                rel=(e["x"] - self.cachedpos[0],e["y"] - self.cachedpos[1])
-                self.cachedpos=(e["x"],e["y"])
-                if self.pitft.pigamerotr==90:
-                    e={"x":e["x"],"y":240-e["y"]}
-                    rel=(rel[0],240-rel[1])
-                elif self.pitft.pigamerotr==270:
-                    e={"x":320-e["x"],"y":e["y"]}
-                    rel=(320-rel[0],rel[1])
-                else:
-                    raise(Exception("PiTft rotation is unsupported"))
+                if r is None:
+                    continue
+                # missing axes (e.g. after a tracking id reset) keep the last raw value
+                if r["x"] is not None:
+                    self.cachedraw[0]=r["x"]
+                if r["y"] is not None:
+                    self.cachedraw[1]=r["y"]
+                pos=self.transform.map(self.cachedraw[0],self.cachedraw[1])
+                rel=(pos[0]-self.cachedpos[0],pos[1]-self.cachedpos[1])
+                self.cachedpos=pos
                 d={}
                 t=MOUSEBUTTONUP if r["touch"]==0 else (MOUSEMOTION if self.pitft.button_down else MOUSEBUTTONDOWN)
-                if self.invertx:
-                    e={"x":320-e["x"],"y":e["y"]}
-                    rel=(320-rel[0],rel[1])
-                if self.inverty:
-                    rel=(rel[0],240-rel[1])
-                    e={"y":240-e["y"],"x":e["x"]}
-                if self.swapxy:
-                    rel=(rel[1],rel[0])
-                    e={"x":e["y"],"y":e["x"]}
                 if t==MOUSEBUTTONDOWN:
                     d["button"]=1
-                    d["pos"]=(e["x"],e["y"])
+                    d["pos"]=pos
                     self.pitft.button_down = True
-                    pygame.mouse.set_pos(e["x"],e["y"])
+                    pygame.mouse.set_pos(pos)
                 elif t==MOUSEBUTTONUP:
                     self.pitft.button_down = False
                     d["button"]=1
-                    d["pos"]=(e["x"],e["y"])
+                    d["pos"]=pos
                 else:
                     d["buttons"]=(True,False,False)
                     d["rel"]=rel
-                    d["pos"]=(e["x"],e["y"])
-                    pygame.mouse.set_pos(e["x"],e["y"])
+                    d["pos"]=pos
+                    pygame.mouse.set_pos(pos)
+                d["t"]=r["time"]    # evdev (wall clock) capture time
                 pe=pygame.event.Event(t,d)
                 pygame.event.post(pe)
+    def _update_coalesced(self):
+        """update() for the coalescing reader: one pygame event per down/up
+        and at most one motion, mouse position set once."""
+        last=None
+        for kind,rx,ry,t in self.pitft.drain():
+            pos=self.transform.map(rx,ry)
+            if kind==pitft_touchscreen.TOUCH_DOWN:
+                self.pitft.button_down=True
+                pe=pygame.event.Event(MOUSEBUTTONDOWN,button=1,pos=pos,t=t)
+                last=pos
+            elif kind==pitft_touchscreen.TOUCH_UP:
+                self.pitft.button_down=False
+                pe=pygame.event.Event(MOUSEBUTTONUP,button=1,pos=pos,t=t)
+            else:
+                rel=(pos[0]-self.cachedpos[0],pos[1]-self.cachedpos[1])
+                pe=pygame.event.Event(MOUSEMOTION,buttons=(True,False,False),rel=rel,pos=pos,t=t)
+                last=pos
+            self.cachedpos=pos
+            pygame.event.post(pe)
+        if last is not None:
+            pygame.mouse.set_pos(last)
+    def touch_stats(self):
+        """Reader counters (coalescing mode only)."""
+        if self.coalesce:
+            return self.pitft.stats()
     def __del__(self):
         """Cleaning up Touchscreen events and Threads when the Object destroyed."""
         self.pitft.stop()
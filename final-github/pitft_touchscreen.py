@@ -9,6 +9,7 @@ except ImportError:
     print("Evdev package is not installed.  Run 'pip3 install evdev' or 'pip install evdev' (Python 2.7) to install.")
     raise(ImportError("Evdev package not found."))
 import threading
+from collections import deque
 try:
     # python 3.5+
     import queue
@@ -111,3 +112,116 @@ class pitft_touchscreen(threading.Thread):
 
     def __del__(self):
         self.shutdown.set()
+
+
+# Event kinds delivered by TouchReader.drain() as (kind, x, y, time) tuples
+TOUCH_UP = 0
+TOUCH_DOWN = 1
+TOUCH_MOVE = 2
+
+
+# Coalescing reader: one thread, compact tuples, at most one motion per drain
+class TouchReader(threading.Thread):
+    def __init__(self, device_path=os.getenv("PIGAME_TS") or "/dev/input/touchscreen", grab=False, capacity=64):
+        super(TouchReader, self).__init__()
+        # daemon: read_loop() blocks, so the thread can't always see shutdown
+        self.daemon = True
+        self.device_path = device_path
+        self.grab = grab
+        self.capacity = capacity
+        self.shutdown = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = deque()
+        # counters
+        self.read = 0        # SYN_REPORTs turned into touch state
+        self.coalesced = 0   # motion reports merged into a later one
+        self.dropped = 0     # lost to SYN_DROPPED or a full queue
+
+    def run(self):
+        try:
+            device = evdev.InputDevice(self.device_path)
+            if self.grab:
+                device.grab()
+        except Exception as ex:
+            print("Unable to load device {0} due to a {1} exception with"
+                  " message: {2}.".format(self.device_path, type(ex).__name__, str(ex)))
+            return
+        ecodes = evdev.ecodes
+        x = y = 0
+        touch = 0
+        down = False
+        dropping = False
+        for input_event in device.read_loop():
+            if self.shutdown.is_set():
+                break
+            etype = input_event.type
+            if etype == ecodes.EV_ABS:
+                if input_event.code == ecodes.ABS_X:
+                    x = input_event.value
+                elif input_event.code == ecodes.ABS_Y:
+                    y = input_event.value
+            elif etype == ecodes.EV_KEY:
+                if input_event.code == ecodes.BTN_TOUCH:
+                    touch = input_event.value
+            elif etype == ecodes.EV_SYN:
+                if input_event.code == ecodes.SYN_DROPPED:
+                    # kernel buffer overflowed: ignore the partial report
+                    dropping = True
+                    self.dropped += 1
+                elif input_event.code == ecodes.SYN_REPORT:
+                    if dropping:
+                        dropping = False
+                        continue
+                    if touch and not down:
+                        kind = TOUCH_DOWN
+                        down = True
+                    elif touch:
+                        kind = TOUCH_MOVE
+                    elif down:
+                        kind = TOUCH_UP
+                        down = False
+                    else:
+                        continue
+                    self.read += 1
+                    self._push((kind, x, y, input_event.timestamp()))
+        if self.grab:
+            device.ungrab()
+
+    def _push(self, event):
+        with self._lock:
+            pending = self._pending
+            if event[0] == TOUCH_MOVE and pending and pending[-1][0] == TOUCH_MOVE:
+                # a newer position replaces the one not yet delivered
+                pending[-1] = event
+                self.coalesced += 1
+                return
+            if len(pending) >= self.capacity:
+                pending.popleft()
+                self.dropped += 1
+            pending.append(event)
+
+    def drain(self):
+        """Returns pending events in order: every down/up, and a motion only
+        if it is the newest event (earlier ones are stale by now)."""
+        with self._lock:
+            if not self._pending:
+                return ()
+            batch = self._pending
+            self._pending = deque()
+            last = len(batch) - 1
+            events = [e for i, e in enumerate(batch) if e[0] != TOUCH_MOVE or i == last]
+            # Same counter as _push() on the reader thread
+            self.coalesced += len(batch) - len(events)
+        return events
+
+    def queue_empty(self):
+        return not self._pending
+
+    def stats(self):
+        return {"read": self.read, "coalesced": self.coalesced, "dropped": self.dropped}
+
+    def stop(self):
+        self.shutdown.set()
+
+    def __del__(self):
+        self.shutdown.set()
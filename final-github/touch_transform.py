@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#  piTFT touch coordinate mapping, compiled once into a single affine transform
+
+import json
+
+
+class TouchTransform:
+    """Raw touchscreen -> screen coordinates as one affine map:
+        x = a*rx + b*ry + c
+        y = d*rx + e*ry + f
+    Build it from the pigame rotation/invert/swap options, or from a
+    3-point calibration."""
+
+    def __init__(self, matrix):
+        (self.a, self.b, self.c), (self.d, self.e, self.f) = matrix
+
+    @property
+    def matrix(self):
+        return [[self.a, self.b, self.c], [self.d, self.e, self.f]]
+
+    @classmethod
+    def from_options(cls, rotation, invertx=False, inverty=False, swapxy=False, width=320, height=240):
+        """Same mapping PiTft used to apply per event, composed up front."""
+        # the panel reports x/y swapped relative to the screen
+        a, b, c, d, e, f = 0, 1, 0, 1, 0, 0
+        if rotation == 90:
+            d, e, f = -d, -e, height - f
+        elif rotation == 270:
+            a, b, c = -a, -b, width - c
+        else:
+            raise(Exception("PiTft rotation is unsupported"))
+        if invertx:
+            a, b, c = -a, -b, width - c
+        if inverty:
+            d, e, f = -d, -e, height - f
+        if swapxy:
+            a, b, c, d, e, f = d, e, f, a, b, c
+        return cls([[a, b, c], [d, e, f]])
+
+    @classmethod
+    def from_calibration(cls, raw, screen):
+        """Solve the transform that maps 3 raw touch points onto 3 screen points."""
+        (x1, y1), (x2, y2), (x3, y3) = raw
+        det = x1 * (y2 - y3) - y1 * (x2 - x3) + (x2 * y3 - x3 * y2)
+        if det == 0:
+            raise ValueError("Calibration points are collinear")
+
+        def solve(v1, v2, v3):
+            # Cramer's rule on [rx ry 1] . [p q r] = v
+            p = (v1 * (y2 - y3) - y1 * (v2 - v3) + (v2 * y3 - v3 * y2)) / det
+            q = (x1 * (v2 - v3) - v1 * (x2 - x3) + (x2 * v3 - x3 * v2)) / det
+            r = (x1 * (y2 * v3 - y3 * v2) - y1 * (x2 * v3 - x3 * v2) + v1 * (x2 * y3 - x3 * y2)) / det
+            return [p, q, r]
+
+        (sx1, sy1), (sx2, sy2), (sx3, sy3) = screen
+        return cls([solve(sx1, sx2, sx3), solve(sy1, sy2, sy3)])
+
+    @classmethod
+    def load(cls, path):
+        """JSON file with either {"matrix": [[a,b,c],[d,e,f]]} or
+        {"raw": [[x,y]]*3, "screen": [[x,y]]*3}."""
+        with open(path) as fp:
+            data = json.load(fp)
+        if "matrix" in data:
+            return cls(data["matrix"])
+        return cls.from_calibration(data["raw"], data["screen"])
+
+    def save(self, path):
+        with open(path, "w") as fp:
+            json.dump({"matrix": self.matrix}, fp)
+
+    def map(self, rx, ry):
+        return (int(round(self.a * rx + self.b * ry + self.c)),
+                int(round(self.d * rx + self.e * ry + self.f)))
+
+    def map_delta(self, drx, dry):
+        """Raw movement -> screen movement (no translation)."""
+        return (int(round(self.a * drx + self.b * dry)),
+                int(round(self.d * drx + self.e * dry)))
+
+    def map_points(self, points):
+        """Transform many raw (x, y) points at once."""
+        a, b, c, d, e, f = self.a, self.b, self.c, self.d, self.e, self.f
+        return [(int(round(a * rx + b * ry + c)), int(round(d * rx + e * ry + f)))
+                for rx, ry in points]
@@ -0,0 +1,110 @@
+import os
+import weakref
+from collections import OrderedDict
+
+import pygame
+from constants.global_var import ASSET_CACHE_SIZE, TEXT_CACHE_SIZE, RED
+
+class AssetCache:
+    """Process-wide surface cache: every (kind, source, size, flags) key is
+    loaded, converted and scaled once, then shared by all sprites.
+    Surfaces handed out are shared, so callers must never draw on them."""
+
+    def __init__(self, max_size=ASSET_CACHE_SIZE):
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Collision masks live exactly as long as the surface they describe
+        self._masks = weakref.WeakKeyDictionary()
+        self.mask_builds = 0
+
+    def _get(self, key, build):
+        surf = self._cache.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = build()
+        self._cache[key] = surf
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    @staticmethod
+    def _to_display(surf, alpha):
+        # convert() needs a display mode; before set_mode keep the raw surface
+        if pygame.display.get_surface() is None:
+            return surf
+        return surf.convert_alpha() if alpha else surf.convert()
+
+    def image(self, path, size=None, alpha=True):
+        """Image file, optionally scaled. Falls back to a red block if missing."""
+        def build():
+            if os.path.exists(path):
+                surf = self._to_display(pygame.image.load(path), alpha)
+                if size is not None:
+                    surf = pygame.transform.scale(surf, size)
+                return surf
+            print(f"[Assets] Missing {path}, using placeholder")
+            surf = pygame.Surface(size or (30, 30))
+            surf.fill(RED)
+            return self._to_display(surf, False)
+        return self._get(("image", path, size, alpha), build)
+
+    def solid(self, size, color):
+        """Opaque rectangle filled with a single color."""
+        def build():
+            surf = pygame.Surface(size)
+            surf.fill(color)
+            return self._to_display(surf, False)
+        return self._get(("solid", size, color), build)
+
+    def polygon(self, size, color, points):
+        """Transparent surface with a filled polygon drawn on it."""
+        points = tuple(tuple(p) for p in points)
+        def build():
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.polygon(surf, color, points)
+            return self._to_display(surf, True)
+        return self._get(("polygon", size, color, points), build)
+
+    def mask(self, surf):
+        """Collision mask of a cached surface, built once and shared."""
+        m = self._masks.get(surf)
+        if m is None:
+            m = self._masks[surf] = pygame.mask.from_surface(surf)
+            self.mask_builds += 1
+        return m
+
+    def text(self, font, string, color, antialias=True):
+        """Rendered text, rasterized once per (font, string, color, antialias)."""
+        return self._get(("text", font, string, color, antialias),
+                         lambda: font.render(string, antialias, color))
+
+    def preload(self, loaders):
+        """Call each loader once at startup so gameplay never misses.
+        Run this after pygame.display.set_mode() so surfaces get converted."""
+        for load in loaders:
+            load()
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._cache),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "mask_builds": self.mask_builds,
+        }
+
+# Shared instance used by all sprite classes
+assets = AssetCache()
+# Separate LRU for text, so changing labels can't evict sprite surfaces
+texts = AssetCache(TEXT_CACHE_SIZE)
@@ -0,0 +1,128 @@
+"""Offline orientation filter for recorded IMU logs (needs numpy).
+
+Runs the same math as FastQuaternion.integrate() over a whole log at once.
+Everything that does not depend on the filter state (bias removal, gyro
+half-angles, accel normalization, Euler conversion) is vectorized; the
+recurrence itself runs either as a tight scalar loop (one beta) or as numpy
+ops across all betas at once (beta sweep).
+"""
+import math
+
+import numpy as np
+
+from constants.global_var import FILTER_BETA
+from utils.quaternion import FastQuaternion
+
+def filter_batch(accel, gyro, t, beta=FILTER_BETA, gyro_offset=(0.0, 0.0, 0.0), q0=None):
+    """accel, gyro: (N, 3) arrays in driver units (m/s^2, rad/s); t: (N,) seconds.
+    beta: scalar, or 1-D array of B values to sweep in one pass.
+    q0: initial (w, x, y, z); defaults to the gravity vector of sample 0.
+
+    Like the FIFO path, sample 0 only seeds the clock, so roll[0]/pitch[0]
+    are the initial orientation. Returns (roll, pitch) in degrees with shape
+    (N,) for a scalar beta or (N, B) for a sweep.
+    """
+    accel = np.asarray(accel, dtype=float)
+    gyro = np.asarray(gyro, dtype=float) - np.asarray(gyro_offset, dtype=float)
+    t = np.asarray(t, dtype=float)
+    betas = np.atleast_1d(np.asarray(beta, dtype=float))
+    n = len(t)
+
+    dt = np.zeros(n)
+    dt[1:] = np.diff(t)
+    half = gyro * dt[:, None] * 0.5
+
+    ax, ay, az = accel[:, 0], accel[:, 1], accel[:, 2]
+    norm = np.sqrt(ax*ax + ay*ay + az*az)
+    valid = norm > 0.1
+    an = accel / np.where(valid, norm, 1.0)[:, None]
+
+    if q0 is None:
+        q = FastQuaternion.from_accel(*accel[0])
+        q0 = (q.w, q.x, q.y, q.z)
+
+    quats = np.empty((n, len(betas), 4))
+    quats[0] = q0
+    if len(betas) == 1:
+        _run_scalar(quats[:, 0], q0, half, an, valid, float(betas[0]))
+    else:
+        _run_sweep(quats, half, an, valid, betas)
+
+    roll, pitch = quat_to_euler(quats)
+    if np.ndim(beta) == 0:
+        return roll[:, 0], pitch[:, 0]
+    return roll, pitch
+
+def quat_to_euler(q):
+    """Vectorized FastQuaternion.to_euler over (..., 4) arrays, in degrees."""
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    roll = np.arctan2(2*(w*x + y*z), 1 - 2*(x*x + y*y))
+    pitch = np.arcsin(np.clip(2*(w*y - z*x), -1.0, 1.0))
+    return np.degrees(roll), np.degrees(pitch)
+
+def _run_scalar(out, q0, half, an, valid, beta):
+    # Plain floats beat numpy per-element overhead for a single state
+    w, x, y, z = q0
+    half = half.tolist()
+    an = an.tolist()
+    valid = valid.tolist()
+    for i in range(1, len(out)):
+        hx, hy, hz = half[i]
+        w, x, y, z = (w - x*hx - y*hy - z*hz,
+                      w*hx + x + y*hz - z*hy,
+                      w*hy - x*hz + y + z*hx,
+                      w*hz + x*hy - y*hx + z)
+        m = math.sqrt(w*w + x*x + y*y + z*z)
+        if m != 0:
+            w = w/m; x = x/m; y = y/m; z = z/m
+
+        if valid[i]:
+            axn, ayn, azn = an[i]
+            vx = 2*(x*z - w*y)
+            vy = 2*(y*z + w*x)
+            vz = w*w - x*x - y*y + z*z
+            cx = beta*((ayn*vz) - (azn*vy))
+            cy = beta*((azn*vx) - (axn*vz))
+            cz = beta*((axn*vy) - (ayn*vx))
+            w, x, y, z = (w - x*cx - y*cy - z*cz,
+                          w*cx + x + y*cz - z*cy,
+                          w*cy - x*cz + y + z*cx,
+                          w*cz + x*cy - y*cx + z)
+            m = math.sqrt(w*w + x*x + y*y + z*z)
+            if m != 0:
+                w = w/m; x = x/m; y = y/m; z = z/m
+
+        out[i] = (w, x, y, z)
+
+def _normalize(w, x, y, z):
+    m = np.sqrt(w*w + x*x + y*y + z*z)
+    m[m == 0] = 1.0
+    return w/m, x/m, y/m, z/m
+
+def _run_sweep(out, half, an, valid, betas):
+    # One state per beta; every op below acts on all B filters at once
+    w, x, y, z = (out[0, :, k].copy() for k in range(4))
+    for i in range(1, len(out)):
+        hx, hy, hz = half[i]
+        w, x, y, z = _normalize(w - x*hx - y*hy - z*hz,
+                                w*hx + x + y*hz - z*hy,
+                                w*hy - x*hz + y + z*hx,
+                                w*hz + x*hy - y*hx + z)
+
+        if valid[i]:
+            axn, ayn, azn = an[i]
+            vx = 2*(x*z - w*y)
+            vy = 2*(y*z + w*x)
+            vz = w*w - x*x - y*y + z*z
+            cx = betas*((ayn*vz) - (azn*vy))
+            cy = betas*((azn*vx) - (axn*vz))
+            cz = betas*((axn*vy) - (ayn*vx))
+            w, x, y, z = _normalize(w - x*cx - y*cy - z*cz,
+                                    w*cx + x + y*cz - z*cy,
+                                    w*cy - x*cz + y + z*cx,
+                                    w*cz + x*cy - y*cx + z)
+
+        out[i, :, 0] = w
+        out[i, :, 1] = x
+        out[i, :, 2] = y
+        out[i, :, 3] = z
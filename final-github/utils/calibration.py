@@ -0,0 +1,40 @@
+import json
+import os
+import time
+
+from constants.global_var import CALIBRATION_FILE, CALIBRATION_MAX_AGE_HOURS, CALIBRATION_MAX_TEMP_DELTA
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_calibration(key, path=CALIBRATION_FILE, temperature=None,
+                     max_age_hours=CALIBRATION_MAX_AGE_HOURS, max_temp_delta=CALIBRATION_MAX_TEMP_DELTA):
+    """Cached gyro offsets (gx, gy, gz) for this device, or None if there is
+    none or it is stale: too old, or taken at a too different temperature."""
+    entry = _read(path).get(key)
+    if not entry:
+        return None
+    age_hours = (time.time() - entry.get("time", 0)) / 3600.0
+    if age_hours > max_age_hours:
+        print(f"[Hardware] Cached calibration is {age_hours:.0f} h old, recalibrating.")
+        return None
+    saved_temp = entry.get("temperature")
+    if temperature is not None and saved_temp is not None and abs(temperature - saved_temp) > max_temp_delta:
+        print(f"[Hardware] Calibrated at {saved_temp:.1f} C, now {temperature:.1f} C, recalibrating.")
+        return None
+    return tuple(entry["gyro"])
+
+def save_calibration(key, offsets, path=CALIBRATION_FILE, temperature=None):
+    data = _read(path)
+    data[key] = {"gyro": list(offsets), "time": time.time()}
+    if temperature is not None:
+        data[key]["temperature"] = temperature
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    # Atomic replace so a crash mid-write never leaves a broken file
+    os.replace(tmp, path)
@@ -0,0 +1,113 @@
+from constants.global_var import PLAY_AREA, SPATIAL_CELL, PIXEL_COLLISIONS
+
+class SpatialHash:
+    """Uniform-grid broadphase over PLAY_AREA.
+    groupcollide()/spritecollide() behave like the pygame.sprite functions of
+    the same name, but only test pairs that share a cell. With masks, a rect
+    hit between two sprites that both have a .mask is confirmed with
+    mask.overlap() (like collide_mask, but on the shared cached masks).
+    Sprites outside the area are clamped into the border cells.
+
+    Counters per frame: rect_tests, mask_tests, hits, and naive
+    (the rect tests a plain pygame.sprite call would have done)."""
+
+    def __init__(self, area=PLAY_AREA, cell=SPATIAL_CELL, masks=PIXEL_COLLISIONS):
+        self.area = area
+        self.cell = cell
+        self.masks = masks
+        self.cols = max(1, -(-area.width // cell))
+        self.rows = max(1, -(-area.height // cell))
+        self._cells = [[] for _ in range(self.cols * self.rows)]
+        self._used = []
+        self.rect_tests = 0
+        self.mask_tests = 0
+        self.naive = 0
+        self.hits = 0
+        self.last_frame = {"rect_tests": 0, "mask_tests": 0, "naive": 0, "hits": 0}
+
+    def begin_frame(self):
+        # Publish last frame's counters and start counting again
+        self.last_frame = {"rect_tests": self.rect_tests, "mask_tests": self.mask_tests,
+                           "naive": self.naive, "hits": self.hits}
+        self.rect_tests = self.mask_tests = self.naive = self.hits = 0
+
+    def _span(self, rect):
+        c = self.cell
+        x0 = min(max((rect.left - self.area.left) // c, 0), self.cols - 1)
+        x1 = min(max((rect.right - 1 - self.area.left) // c, 0), self.cols - 1)
+        y0 = min(max((rect.top - self.area.top) // c, 0), self.rows - 1)
+        y1 = min(max((rect.bottom - 1 - self.area.top) // c, 0), self.rows - 1)
+        return x0, x1, y0, y1
+
+    def rebuild(self, group):
+        for i in self._used:
+            self._cells[i].clear()
+        self._used.clear()
+        cols = self.cols
+        for s in group:
+            x0, x1, y0, y1 = self._span(s.rect)
+            for y in range(y0, y1 + 1):
+                row = y * cols
+                for x in range(x0, x1 + 1):
+                    bucket = self._cells[row + x]
+                    if not bucket:
+                        self._used.append(row + x)
+                    bucket.append(s)
+
+    def _query(self, sprite, dead):
+        rect = sprite.rect
+        mask = getattr(sprite, "mask", None) if self.masks else None
+        hits = []
+        seen = set()
+        x0, x1, y0, y1 = self._span(rect)
+        cols = self.cols
+        for y in range(y0, y1 + 1):
+            row = y * cols
+            for x in range(x0, x1 + 1):
+                for s in self._cells[row + x]:
+                    if s in seen or s in dead:
+                        continue
+                    seen.add(s)
+                    self.rect_tests += 1
+                    if not rect.colliderect(s.rect):
+                        continue
+                    other = s.mask if mask is not None and hasattr(s, "mask") else None
+                    if other is not None:
+                        self.mask_tests += 1
+                        if not mask.overlap(other, (s.rect.x - rect.x, s.rect.y - rect.y)):
+                            continue
+                    hits.append(s)
+        return hits
+
+    def spritecollide(self, sprite, group, dokill):
+        self.rebuild(group)
+        self.naive += len(group)
+        hits = self._query(sprite, ())
+        self.hits += len(hits)
+        if dokill:
+            for s in hits:
+                s.kill()
+        return hits
+
+    def groupcollide(self, groupa, groupb, dokilla, dokillb):
+        self.rebuild(groupb)
+        self.naive += len(groupa) * len(groupb)
+        crashed = {}
+        # Like pygame, a killed b can't be hit again by a later a
+        dead = set()
+        for a in groupa.sprites():
+            hits = self._query(a, dead)
+            if not hits:
+                continue
+            crashed[a] = hits
+            self.hits += len(hits)
+            if dokillb:
+                for b in hits:
+                    b.kill()
+                    dead.add(b)
+            if dokilla:
+                a.kill()
+        return crashed
+
+    def stats(self):
+        return dict(self.last_frame, cells=self.cols * self.rows, cell_size=self.cell)
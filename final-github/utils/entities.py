@@ -0,0 +1,116 @@
+"""Struct-of-arrays entity store (needs numpy).
+
+Positions, previous positions, velocities and alive flags of one kind of
+entity live in contiguous arrays, so a simulation step, off-screen culling
+and AABB overlap tests are a handful of vectorized operations instead of a
+Python update() per sprite. Rect semantics match pygame: the drawn/collided
+rect is (int(x), int(y), w, h) and touching edges don't overlap."""
+import numpy as np
+
+class EntityStore:
+    def __init__(self, capacity, size):
+        self.capacity = capacity
+        self.w, self.h = size
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Spawn order, so pair results can follow sprite-group order
+        self.serial = np.zeros(capacity, dtype=np.int64)
+        self.spawned = 0
+        self._free = list(range(capacity - 1, -1, -1))
+        self.high_water = 0
+        self.exhausted = 0
+
+    def __len__(self):
+        return self.capacity - len(self._free)
+
+    def spawn(self, x, y, vx=0.0, vy=0.0):
+        """Returns the slot index, or None if the store is full."""
+        if not self._free:
+            self.exhausted += 1
+            return None
+        i = self._free.pop()
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.alive[i] = True
+        self.serial[i] = self.spawned
+        self.spawned += 1
+        if len(self) > self.high_water:
+            self.high_water = len(self)
+        return i
+
+    def kill(self, idx):
+        idx = np.asarray(idx, dtype=np.intp)
+        idx = idx[self.alive[idx]]
+        self.alive[idx] = False
+        self._free.extend(idx.tolist())
+        return len(idx)
+
+    def clear(self):
+        self.kill(np.flatnonzero(self.alive))
+
+    def step(self):
+        # Dead slots move too: cheaper than masking, and spawn() overwrites them
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.x += self.vx
+        self.y += self.vy
+
+    def _rects(self, idx):
+        return self.x[idx].astype(np.int32), self.y[idx].astype(np.int32)
+
+    def cull(self, area):
+        """Kill everything whose rect lies beyond area (a pygame.Rect):
+        left of it, above it, or starting past its right/bottom edge."""
+        idx = np.flatnonzero(self.alive)
+        ix, iy = self._rects(idx)
+        out = (ix + self.w < area.left) | (iy + self.h < area.top) | \
+              (ix > area.right) | (iy > area.bottom)
+        return self.kill(idx[out])
+
+    def overlap_rect(self, rect):
+        """Alive slots whose rect overlaps rect."""
+        idx = np.flatnonzero(self.alive)
+        ix, iy = self._rects(idx)
+        hit = (ix < rect.right) & (rect.left < ix + self.w) & \
+              (iy < rect.bottom) & (rect.top < iy + self.h)
+        return idx[hit]
+
+    def overlap_pairs(self, other):
+        """(mine, theirs) slot arrays of every overlapping alive pair, mine
+        in spawn order like a sprite group's iteration. One broadcast N x M
+        test."""
+        a = np.flatnonzero(self.alive)
+        a = a[np.argsort(self.serial[a], kind="stable")]
+        b = np.flatnonzero(other.alive)
+        if not len(a) or not len(b):
+            return a[:0], b[:0]
+        ax, ay = self._rects(a)
+        bx, by = other._rects(b)
+        hit = (ax[:, None] < bx[None, :] + other.w) & (bx[None, :] < ax[:, None] + self.w) & \
+              (ay[:, None] < by[None, :] + other.h) & (by[None, :] < ay[:, None] + self.h)
+        i, j = np.nonzero(hit)
+        return a[i], b[j]
+
+    def positions(self, alpha):
+        """Top-left corners of alive entities between the last two steps."""
+        idx = np.flatnonzero(self.alive)
+        px, py = self.prev_x[idx], self.prev_y[idx]
+        xs = (px + (self.x[idx] - px) * alpha).astype(np.int32)
+        ys = (py + (self.y[idx] - py) * alpha).astype(np.int32)
+        return zip(xs.tolist(), ys.tolist())
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "in_use": len(self),
+            "free": len(self._free),
+            "high_water": self.high_water,
+            "exhausted": self.exhausted,
+        }
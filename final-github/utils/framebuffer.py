@@ -0,0 +1,129 @@
+"""Present frames by writing straight into an mmap()ed Linux framebuffer
+instead of going through SDL's fbcon driver.
+
+The game draws into an ordinary 32-bit surface. present() converts only the
+dirty rects to the framebuffer's pixel format (e.g. RGB565) with one SDL
+blit into a shadow surface of that format, then copies those rows into the
+mapped device memory. A regular file of the right size works in place of
+/dev/fbN, which is how this is tested off the Pi."""
+import fcntl
+import mmap
+import os
+import struct
+
+import pygame
+from constants.global_var import FB_DEVICE
+
+FBIOGET_VSCREENINFO = 0x4600
+FBIOGET_FSCREENINFO = 0x4602
+
+# struct fb_var_screeninfo: xres ... bits_per_pixel, grayscale, then
+# red/green/blue/transp as (offset, length, msb_right); 40 u32s in total
+_VAR = struct.Struct("=40I")
+# struct fb_fix_screeninfo up to line_length (native alignment: the
+# unsigned long moves the offsets between 32- and 64-bit kernels)
+_FIX = struct.Struct("@16sLIIIIHHHI")
+
+class FbInfo:
+    """Framebuffer geometry and pixel format. red/green/blue are
+    (bit offset, bit length) inside a pixel."""
+
+    def __init__(self, width, height, bpp=16, stride=None,
+                 red=(11, 5), green=(5, 6), blue=(0, 5)):
+        self.width = width
+        self.height = height
+        self.bpp = bpp
+        self.stride = stride or width * bpp // 8
+        self.red, self.green, self.blue = red, green, blue
+
+    @property
+    def masks(self):
+        return tuple(((1 << length) - 1) << offset
+                     for offset, length in (self.red, self.green, self.blue)) + (0,)
+
+    @property
+    def size(self):
+        return self.stride * self.height
+
+    def __repr__(self):
+        return (f"FbInfo({self.width}x{self.height}, {self.bpp} bpp, stride {self.stride}, "
+                f"rgb {self.red}/{self.green}/{self.blue})")
+
+def read_fb_info(fd):
+    """Query a framebuffer device with the FBIOGET_* ioctls."""
+    var = _VAR.unpack(fcntl.ioctl(fd, FBIOGET_VSCREENINFO, bytes(_VAR.size)))
+    fix = _FIX.unpack(fcntl.ioctl(fd, FBIOGET_FSCREENINFO, bytes(_FIX.size)))
+    return FbInfo(var[0], var[1], bpp=var[6], stride=fix[-1],
+                  red=var[8:10], green=var[11:13], blue=var[14:16])
+
+class FramebufferPresenter:
+    def __init__(self, surface, device=FB_DEVICE, info=None):
+        """info describes the target; leave it None to ask the device.
+        Pass it explicitly when device is a plain file."""
+        self.surface = surface
+        self.fd = os.open(device, os.O_RDWR)
+        try:
+            if info is None:
+                info = read_fb_info(self.fd)
+            if info.bpp not in (16, 32):
+                raise ValueError(f"{device}: unsupported {info.bpp} bpp framebuffer")
+            self.mm = mmap.mmap(self.fd, info.size, mmap.MAP_SHARED,
+                                mmap.PROT_READ | mmap.PROT_WRITE)
+        except Exception:
+            os.close(self.fd)
+            raise
+        self.info = info
+        self.bytes_per_pixel = info.bpp // 8
+        # Only the part of the surface that fits on the panel is shown
+        self.area = surface.get_rect().clip(pygame.Rect(0, 0, info.width, info.height))
+        self.shadow = pygame.Surface(self.area.size, 0, info.bpp, info.masks)
+        self.frames = 0
+        self.bytes_written = 0
+        print(f"[Framebuffer] {device}: {info}")
+
+    def present(self, rects=None):
+        """Push rects (default: everything) of the surface to the framebuffer."""
+        if rects is None:
+            rects = [self.area]
+        shadow = self.shadow
+        clipped = []
+        for r in rects:
+            r = self.area.clip(r)
+            if r.width and r.height:
+                shadow.blit(self.surface, r, r)     # SDL does the pixel format conversion
+                clipped.append(r)
+
+        bpp = self.bytes_per_pixel
+        stride = self.info.stride
+        pitch = shadow.get_pitch()
+        mm = self.mm
+        view = shadow.get_view("0")
+        src = memoryview(view).cast("B")
+        try:
+            for r in clipped:
+                n = r.width * bpp
+                if r.width == self.area.width and pitch == stride:
+                    # Whole rows: one contiguous copy
+                    a, b = r.y * stride, r.bottom * stride
+                    mm[a:b] = src[a:b]
+                else:
+                    s = r.y * pitch + r.x * bpp
+                    d = r.y * stride + r.x * bpp
+                    for _ in range(r.height):
+                        mm[d:d + n] = src[s:s + n]
+                        s += pitch
+                        d += stride
+                self.bytes_written += n * r.height
+        finally:
+            # The view locks the shadow; blits fail until it is released
+            src.release()
+            del view
+        self.frames += 1
+
+    def stats(self):
+        return {"frames": self.frames, "bytes_written": self.bytes_written,
+                "bytes_per_frame": self.bytes_written / self.frames if self.frames else 0.0}
+
+    def close(self):
+        self.mm.close()
+        os.close(self.fd)
@@ -0,0 +1,144 @@
+"""All GPIO buttons in one place. Edge callbacks only append a timestamped
+record to a bounded ring; the game loop drains it once per frame with poll().
+
+The ring has exactly one producer (RPi.GPIO runs every edge callback on its
+single event thread) and one consumer (the game loop). The producer only
+writes `_head`, the consumer only writes `_tail`, and each slot is filled
+before `_head` moves past it, so no lock is needed."""
+import os
+import time
+
+from constants.global_var import (SHOOT_GPIO, BAILOUT_GPIO, GPIO_BACKEND,
+                                  GPIO_QUEUE_SIZE, GPIO_BOUNCE_MS)
+
+BACKENDS = ("auto", "real", "stub")
+
+class RPiGPIOBackend:
+    def __init__(self):
+        # Imported here so desktop runs never need RPi.GPIO
+        import RPi.GPIO as GPIO
+        self.GPIO = GPIO
+        self.pins = []
+        GPIO.setmode(GPIO.BCM)
+
+    def setup(self, pin, callback, bouncetime):
+        GPIO = self.GPIO
+        GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        GPIO.add_event_detect(pin, GPIO.FALLING, callback=callback, bouncetime=bouncetime)
+        self.pins.append(pin)
+
+    def cleanup(self):
+        if self.pins:
+            self.GPIO.cleanup(self.pins)
+            self.pins = []
+
+class StubGPIOBackend:
+    """No hardware: press(pin) fires the edge callback like a real button."""
+
+    def __init__(self):
+        self.callbacks = {}
+
+    def setup(self, pin, callback, bouncetime):
+        self.callbacks[pin] = callback
+
+    def press(self, pin):
+        self.callbacks[pin](pin)
+
+    def cleanup(self):
+        self.callbacks.clear()
+
+def open_gpio_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown GPIO backend {name!r}, expected one of {BACKENDS}")
+    if name == "stub":
+        return StubGPIOBackend()
+    try:
+        return RPiGPIOBackend()
+    except Exception as e:
+        if name == "real":
+            raise
+        print(f"[GPIO] RPi.GPIO not available, buttons disabled: {e}")
+        return StubGPIOBackend()
+
+class InputBatch:
+    """Edges since the previous poll(): (name, timestamp) in order, plus counts."""
+
+    def __init__(self, names):
+        self.events = []
+        self.counts = dict.fromkeys(names, 0)
+
+    def count(self, name):
+        return self.counts[name]
+
+class GPIOInput:
+    def __init__(self, pins=None, backend=None, capacity=GPIO_QUEUE_SIZE,
+                 bouncetime=GPIO_BOUNCE_MS):
+        if pins is None:
+            pins = {"shoot": SHOOT_GPIO, "bailout": BAILOUT_GPIO}
+        self.names = tuple(pins)
+        self._name_of = {pin: name for name, pin in pins.items()}
+        self.pins = dict(pins)
+
+        # Power-of-two ring so the slot is a mask, not a modulo
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._mask = size - 1
+        self._names = [None] * size
+        self._times = [0.0] * size
+        self._head = 0      # written by the producer only
+        self._tail = 0      # written by the consumer only
+
+        self.dropped = 0
+        self.edges = 0
+        self.high_water = 0
+        self.max_wait = 0.0
+
+        if backend is None:
+            backend = open_gpio_backend(os.getenv("GPIO_BACKEND", GPIO_BACKEND))
+        self.backend = backend
+        for pin in pins.values():
+            backend.setup(pin, self._on_edge, bouncetime)
+
+    def _on_edge(self, pin):
+        self.push(self._name_of[pin])
+
+    def push(self, name, t=None):
+        """Producer side. Also used to inject presses (session replay)."""
+        head = self._head
+        if head - self._tail > self._mask:
+            self.dropped += 1
+            return
+        i = head & self._mask
+        self._names[i] = name
+        self._times[i] = time.perf_counter() if t is None else t
+        self._head = head + 1
+
+    def poll(self):
+        """Consumer side: everything queued since the last call."""
+        batch = InputBatch(self.names)
+        tail, head = self._tail, self._head
+        if head == tail:
+            return batch
+        now = time.perf_counter()
+        mask = self._mask
+        events, counts = batch.events, batch.counts
+        for n in range(tail, head):
+            name, t = self._names[n & mask], self._times[n & mask]
+            events.append((name, t))
+            counts[name] += 1
+            if now - t > self.max_wait:
+                self.max_wait = now - t
+        self._tail = head
+        self.edges += head - tail
+        if head - tail > self.high_water:
+            self.high_water = head - tail
+        return batch
+
+    def stats(self):
+        return {"edges": self.edges, "dropped": self.dropped,
+                "capacity": self._mask + 1, "high_water": self.high_water,
+                "max_wait_ms": round(self.max_wait * 1000.0, 2)}
+
+    def stop(self):
+        self.backend.cleanup()
@@ -2,168 +2,274 @@ import os
 import sys
 import math
 import time
-import board
-import busio
-from adafruit_lsm6ds.ism330dhcx import ISM330DHCX
-from constants.global_var import FILTER_BETA
-
-# Try importing RPi.GPIO
-try:
-    import RPi.GPIO as GPIO
-    HAVE_GPIO = True
-except Exception:
-    GPIO = None
-    HAVE_GPIO = False
-
-from constants.global_var import BAILOUT_GPIO
-
-BAILOUT_PIN = 27
-
-_bailout_triggered = False
-
-def setup_env_for_pitft():
-    os.putenv("SDL_VIDEODRIVER", "fbcon")
-    os.putenv("SDL_FBDEV", "/dev/fb1")  
-    os.putenv("SDL_MOUSEDRV", "TSLIB")     
-    # Change '/dev/input/touchscreen' to your real path found in Phase 1:
-    os.putenv("SDL_MOUSEDEV", "/dev/input/event1") 
-    os.putenv("DISPLAY", "")
-
-# ... (The rest of the file: setup_bailout_button, cleanup, etc. remains the same)
-def _bailout_cb(channel):
-    global _bailout_triggered
-    print("[GPIO] Bailout button pressed")
-    _bailout_triggered = True
-
-def setup_bailout_button():
-    if not HAVE_GPIO:
-        print("[GPIO] RPi.GPIO not available, bailout button disabled")
-        return
-    GPIO.setmode(GPIO.BCM)
-    GPIO.setup(BAILOUT_GPIO, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    GPIO.add_event_detect(
-        BAILOUT_GPIO,
-        GPIO.FALLING,
-        callback=_bailout_cb,
-        bouncetime=150
-    )
-    print(f"[GPIO] Bailout button set up on BCM {BAILOUT_GPIO}")
-
-def check_bailout():
-    return _bailout_triggered
-    
-def is_bailout_triggered():
-    # If PUD_UP is used, input is False when pressed (connected to GND)
-    return not GPIO.input(BAILOUT_PIN)
-
-def cleanup_bailout_button():
-    if not HAVE_GPIO:
-        return
-    try:
-        GPIO.cleanup()
-        print("[GPIO] Cleaned up")
-    except Exception:
-        pass
-
-class Quaternion:
-    def __init__(self, w, x, y, z):
-        self.w, self.x, self.y, self.z = w, x, y, z
-    
-    def normalize(self):
-        n = math.sqrt(self.w*self.w + self.x*self.x + self.y*self.y + self.z*self.z)
-        if n == 0: return self
-        self.w/=n; self.x/=n; self.y/=n; self.z/=n
-        return self
-
-    def __mul__(self, o):
-        return Quaternion(
-            self.w*o.w - self.x*o.x - self.y*o.y - self.z*o.z,
-            self.w*o.x + self.x*o.w + self.y*o.z - self.z*o.y,
-            self.w*o.y - self.x*o.z + self.y*o.w + self.z*o.x,
-            self.w*o.z + self.x*o.y - self.y*o.x + self.z*o.w
-        )
+import threading
+from constants.global_var import (FILTER_BETA, IMU_THREADED, IMU_SAMPLE_HZ, IMU_FIFO, IMU_FIFO_HZ,
+                                  IMU_FIFO_MAX_GAP, IMU_CLOCK_SLEW,
+                                  IMU_BACKEND, CALIBRATION_FILE, ONLINE_BIAS, BIAS_STILL_GYRO,
+                                  BIAS_STILL_ACCEL, BIAS_SETTLE_SECONDS, BIAS_TAU_SECONDS)
+from utils.imu_backends import open_backend
+from utils.calibration import load_calibration, save_calibration
+from utils.imu_fifo import Ism330Fifo, I2CRegisterBus
+from utils.quaternion import Quaternion, FastQuaternion
+
+class IMUSampler(threading.Thread):
+    """Reads the IMU and runs the filter at its own rate, off the render loop.
+    The game loop only reads `latest`, a ((roll, pitch), capture time) tuple
+    that is replaced with a single reference assignment, so no lock is ever
+    taken."""
+
+    def __init__(self, imu, rate_hz=IMU_SAMPLE_HZ):
+        super().__init__(daemon=True)
+        self.imu = imu
+        self.period = 1.0 / rate_hz
+        self.shutdown = threading.Event()
+        self.latest = (imu.q.to_euler(), None)
+        self.samples = 0
+        self.dropped = 0
+        self.overruns = 0
+        self._start = None
+        # Running mean/variance of sample interval (Welford)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def run(self):
+        sensor = self.imu.sensor
+        self._start = last = time.perf_counter()
+        next_t = last + self.period
+        while not self.shutdown.is_set():
+            # Stamped before the reads, like the per-frame path in update()
+            now = time.perf_counter()
+            try:
+                ax, ay, az = sensor.acceleration
+                gx, gy, gz = sensor.gyro
+            except Exception:
+                # I2C hiccup: skip this slot, keep the previous orientation
+                self.dropped += 1
+            else:
+                dt = now - last
+                last = now
+                self.latest = (self.imu._step(ax, ay, az, gx, gy, gz, dt), now)
+                self._record(dt)
+
+            next_t += self.period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                self.shutdown.wait(delay)
+            else:
+                # Fell behind: resync instead of bursting to catch up
+                self.overruns += 1
+                next_t = time.perf_counter()
+
+    def _record(self, dt):
+        self.samples += 1
+        d = dt - self._mean
+        self._mean += d / self.samples
+        self._m2 += d * (dt - self._mean)
+
+    def stop(self):
+        self.shutdown.set()
 
-    def to_euler(self):
-        sinr = 2*(self.w*self.x + self.y*self.z)
-        cosr = 1 - 2*(self.x*self.x + self.y*self.y)
-        roll = math.atan2(sinr, cosr)
-        
-        sinp = 2*(self.w*self.y - self.z*self.x)
-        if abs(sinp)>=1: pitch = math.copysign(math.pi/2, sinp)
-        else: pitch = math.asin(sinp)
-        
-        return math.degrees(roll), math.degrees(pitch)
+    def stats(self):
+        elapsed = time.perf_counter() - self._start if self._start else 0.0
+        jitter = math.sqrt(self._m2 / self.samples) if self.samples > 1 else 0.0
+        return {
+            "rate_hz": self.samples / elapsed if elapsed > 0 else 0.0,
+            "target_hz": 1.0 / self.period,
+            "jitter_ms": jitter * 1000.0,
+            "samples": self.samples,
+            "dropped": self.dropped,
+            "overruns": self.overruns,
+        }
 
 class IMUHandler:
-    def __init__(self):
-        try:
-            self.i2c = busio.I2C(board.SCL, board.SDA)
-            self.sensor = ISM330DHCX(self.i2c)
-            self.active = True
-            print("[Hardware] IMU found.")
-        except Exception as e:
-            print(f"[Hardware] IMU Error (Running in Mock Mode): {e}")
-            self.active = False
-            self.q = Quaternion(1, 0, 0, 0)
+    def __init__(self, threaded=IMU_THREADED, fifo=IMU_FIFO, backend=None,
+                 calibration_file=CALIBRATION_FILE):
+        self.sampler = None
+        self.fifo = None
+        self.ready = False
+        self.q = FastQuaternion(1, 0, 0, 0)
+        self.sample_time = None     # perf_counter() capture time behind the last update()
+        self.gx_off = self.gy_off = self.gz_off = 0.0
+        self.online_bias = ONLINE_BIAS
+        self._still_time = 0.0
+        self.bias_updates = 0
+        self.threaded = threaded
+        self.fifo_mode = fifo
+        self.calibration_file = calibration_file
+
+        # real / mock / replay, chosen at runtime (IMU_BACKEND env overrides)
+        self.backend = backend or os.getenv("IMU_BACKEND", IMU_BACKEND)
+        self.sensor, self.device_key = open_backend(self.backend)
+        self.active = self.sensor is not None
+        if not self.active:
             return
 
+        offsets = load_calibration(self.device_key, calibration_file, self._temperature())
+        if offsets is not None:
+            self.gx_off, self.gy_off, self.gz_off = offsets
+            print("[Hardware] Using cached gyro calibration.")
+            self._start()
+        else:
+            # Calibrate off the main thread so the menu shows up right away;
+            # update() returns level (0, 0) until this is done
+            threading.Thread(target=self._calibrate_and_start, daemon=True).start()
+
+    def _calibrate_and_start(self):
         self._calibrate_gyro()
+        self._save_calibration()
+        self._start()
+
+    def _temperature(self):
+        # Not every backend (or driver version) has a temperature sensor
+        try:
+            return float(self.sensor.temperature)
+        except Exception:
+            return None
+
+    def _save_calibration(self):
+        save_calibration(self.device_key, (self.gx_off, self.gy_off, self.gz_off),
+                         self.calibration_file, self._temperature())
+
+    def _start(self):
         self._init_quaternion()
 
+        if self.fifo_mode and hasattr(self.sensor, "i2c_device"):
+            # FIFO batches every sample on-chip; no need for a sampler thread
+            self._setup_fifo()
+        elif self.threaded:
+            self.sampler = IMUSampler(self)
+            self.sampler.start()
+            print(f"[Hardware] IMU sampling in background at {IMU_SAMPLE_HZ} Hz.")
+        self.ready = True
+
     def _calibrate_gyro(self):
         print("[Hardware] Calibrating Gyro...")
-        self.gx_off = self.gy_off = self.gz_off = 0.0
+        t0 = time.perf_counter()
+        gx_sum = gy_sum = gz_sum = 0.0
         for _ in range(200):
             gx, gy, gz = self.sensor.gyro
-            self.gx_off += gx
-            self.gy_off += gy
-            self.gz_off += gz
+            gx_sum += gx
+            gy_sum += gy
+            gz_sum += gz
             time.sleep(0.005)
-        self.gx_off /= 200
-        self.gy_off /= 200
-        self.gz_off /= 200
-        print("[Hardware] Calibration Done.")
+        self.gx_off = gx_sum / 200
+        self.gy_off = gy_sum / 200
+        self.gz_off = gz_sum / 200
+        print(f"[Hardware] Calibration Done ({time.perf_counter() - t0:.2f} s).")
+
+    def _setup_fifo(self):
+        from adafruit_lsm6ds import Rate, AccelRange, GyroRange
+        rate = getattr(Rate, f"RATE_{IMU_FIFO_HZ}_HZ")
+        self.sensor.accelerometer_data_rate = rate
+        self.sensor.gyro_data_rate = rate
+        self.fifo = Ism330Fifo(
+            I2CRegisterBus(self.sensor.i2c_device),
+            IMU_FIFO_HZ,
+            AccelRange.lsb[self.sensor.accelerometer_range],
+            GyroRange.lsb[self.sensor.gyro_range],
+        )
+        self.fifo.configure()
+        self._fifo_t = None
+        self._fifo_offset = None
+        self._fifo_read = None
+        self.fifo_gaps = 0
+        self._euler = self.q.to_euler()
+        print(f"[Hardware] IMU FIFO batching at {IMU_FIFO_HZ} Hz.")
 
     def _init_quaternion(self):
-        ax, ay, az = self.sensor.acceleration
         # Calculate initial roll/pitch from gravity vector
-        initial_roll = math.atan2(ay, az)
-        initial_pitch = math.atan2(-ax, math.sqrt(ay*ay + az*az))
-        
-        cr = math.cos(initial_roll/2)
-        sr = math.sin(initial_roll/2)
-        cp = math.cos(initial_pitch/2)
-        sp = math.sin(initial_pitch/2)
-        
-        self.q = Quaternion(cr*cp, sr*cp, cr*sp, -sr*sp).normalize()
+        self.q = FastQuaternion.from_accel(*self.sensor.acceleration)
+
+    def resync(self):
+        """Call when play starts after a stretch without update() calls (the
+        menu): drops the stale FIFO backlog instead of integrating it."""
+        if self.fifo is not None and self.ready:
+            self.fifo.flush()
+            self._fifo_t = None
 
     def update(self, dt):
-        if not self.active: return 0, 0
+        if not self.active or not self.ready: return 0, 0
+        if self.sampler is not None:
+            # Latest orientation published by the background thread
+            euler, self.sample_time = self.sampler.latest
+            return euler
+        if self.fifo is not None:
+            return self._update_fifo()
 
+        self.sample_time = time.perf_counter()
         ax, ay, az = self.sensor.acceleration
         gx, gy, gz = self.sensor.gyro
-        gx -= self.gx_off
-        gy -= self.gy_off
-        gz -= self.gz_off
-
-        # Gyro integration
-        q_delta = Quaternion(1.0, gx*dt*0.5, gy*dt*0.5, gz*dt*0.5)
-        self.q = (self.q * q_delta).normalize()
-
-        # Accelerometer correction (Gradient Descent step)
-        accel_norm = math.sqrt(ax*ax + ay*ay + az*az)
-        if accel_norm > 0.1:
-            axn, ayn, azn = ax/accel_norm, ay/accel_norm, az/accel_norm
-            q = self.q
-            vx = 2*(q.x*q.z - q.w*q.y)
-            vy = 2*(q.y*q.z + q.w*q.x)
-            vz = q.w*q.w - q.x*q.x - q.y*q.y + q.z*q.z
-            
-            ex = (ayn*vz) - (azn*vy)
-            ey = (azn*vx) - (axn*vz)
-            ez = (axn*vy) - (ayn*vx)
-            
-            q_corr = Quaternion(1.0, FILTER_BETA*ex, FILTER_BETA*ey, FILTER_BETA*ez)
-            self.q = (self.q * q_corr).normalize()
+        return self._step(ax, ay, az, gx, gy, gz, dt)
 
+    def _update_fifo(self):
+        # Run the filter over every buffered sample with its sensor timestamp
+        overruns = self.fifo.overruns
+        samples = self.fifo.drain()
+        now = time.perf_counter()
+        if self.fifo.overruns != overruns:
+            # Samples were lost: don't integrate across the hole
+            self._fifo_t = None
+        max_dt = IMU_FIFO_MAX_GAP / self.fifo.rate_hz
+        for t, ax, ay, az, gx, gy, gz in samples:
+            if self._fifo_t is not None:
+                dt = t - self._fifo_t
+                if 0.0 < dt <= max_dt:
+                    self._filter(ax, ay, az, gx, gy, gz, dt)
+                else:
+                    self.fifo_gaps += 1
+            self._fifo_t = t
+        if samples:
+            # Sensor clock -> perf_counter: the smallest (read time - sample
+            # time) is the closest to a zero-delay read. The sensor clock runs
+            # a few percent off, so older minima age upwards by IMU_CLOCK_SLEW
+            # and the estimate follows the drift instead of falling behind it
+            offset = now - samples[-1][0]
+            if self._fifo_offset is not None:
+                offset = min(offset, self._fifo_offset + IMU_CLOCK_SLEW * (now - self._fifo_read))
+            self._fifo_offset = offset
+            self._fifo_read = now
+            self.sample_time = samples[-1][0] + self._fifo_offset
+            self._euler = self.q.to_euler()
+        return self._euler
+
+    def stop(self):
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler.join(timeout=0.5)
+            print(f"[Hardware] IMU sampler {self.sampler.stats()}")
+        if self.fifo is not None:
+            print(f"[Hardware] IMU FIFO {dict(self.fifo.stats(), gaps=self.fifo_gaps)}")
+        if self.bias_updates:
+            # Keep the drift-corrected offsets for the next start
+            self._save_calibration()
+            print(f"[Hardware] Gyro bias refined {self.bias_updates} times, saved.")
+
+    def _step(self, ax, ay, az, gx, gy, gz, dt):
+        self._filter(ax, ay, az, gx, gy, gz, dt)
         return self.q.to_euler()
+
+    def _track_bias(self, ax, ay, az, gx, gy, gz, dt):
+        # Online bias estimate: once the board has been at rest (tiny rotation,
+        # accel ~ 1 g) for BIAS_SETTLE_SECONDS, pull the offsets towards the raw
+        # gyro reading with time constant BIAS_TAU_SECONDS
+        if (abs(gx - self.gx_off) > BIAS_STILL_GYRO or abs(gy - self.gy_off) > BIAS_STILL_GYRO
+                or abs(gz - self.gz_off) > BIAS_STILL_GYRO
+                or abs(math.sqrt(ax*ax + ay*ay + az*az) - 9.80665) > BIAS_STILL_ACCEL):
+            self._still_time = 0.0
+            return
+        self._still_time += dt
+        if self._still_time < BIAS_SETTLE_SECONDS:
+            return
+        k = min(dt / BIAS_TAU_SECONDS, 1.0)
+        self.gx_off += k * (gx - self.gx_off)
+        self.gy_off += k * (gy - self.gy_off)
+        self.gz_off += k * (gz - self.gz_off)
+        self.bias_updates += 1
+
+    def _filter(self, ax, ay, az, gx, gy, gz, dt):
+        if self.online_bias:
+            self._track_bias(ax, ay, az, gx, gy, gz, dt)
+        # Allocation-free fused step (see utils.quaternion)
+        self.q.integrate(ax, ay, az,
+                         gx - self.gx_off, gy - self.gy_off, gz - self.gz_off,
+                         dt, FILTER_BETA)
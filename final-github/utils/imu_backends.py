@@ -0,0 +1,87 @@
+import bisect
+import csv
+import socket
+import time
+
+from constants.global_var import IMU_REPLAY_FILE
+
+BACKENDS = ("auto", "real", "mock", "replay")
+
+class ReplaySensor:
+    """Plays back a CSV log (t,ax,ay,az,gx,gy,gz in driver units, t in
+    seconds) through the same .acceleration/.gyro properties as the real
+    driver. Playback follows t in real time from the first read, like the
+    live sensor: a reader polling slower than the log skips rows, one
+    polling faster sees a row again. Code reads acceleration first; the gyro
+    read that follows returns the same row."""
+
+    def __init__(self, path=IMU_REPLAY_FILE, loop=True, clock=time.perf_counter):
+        self.path = path
+        self.loop = loop
+        self.clock = clock
+        with open(path, newline="") as f:
+            self.rows = [tuple(float(v) for v in row[:7])
+                         for row in csv.reader(f) if row and not row[0].startswith(("t", "#"))]
+        if not self.rows:
+            raise ValueError(f"No samples in {path}")
+        self.times = [r[0] for r in self.rows]
+        if any(b < a for a, b in zip(self.times, self.times[1:])):
+            raise ValueError(f"{path}: t must not decrease")
+        n = len(self.rows)
+        # One mean sample period between the last row and the first on a loop
+        self.period = (self.times[-1] - self.times[0]) / (n - 1) if n > 1 else 0.0
+        self._start = None
+        self._paired = None
+        self.index = 0
+
+    def _seek(self):
+        now = self.clock()
+        if self._start is None:
+            self._start = now
+        elapsed = now - self._start
+        length = self.times[-1] - self.times[0] + self.period
+        if self.loop and length > 0:
+            elapsed %= length
+        i = bisect.bisect_right(self.times, self.times[0] + elapsed) - 1
+        self.index = min(max(i, 0), len(self.rows) - 1)
+        return self.rows[self.index]
+
+    @property
+    def acceleration(self):
+        row = self._paired = self._seek()
+        return row[1:4]
+
+    @property
+    def gyro(self):
+        row, self._paired = self._paired or self._seek(), None
+        return row[4:7]
+
+def _open_real():
+    # Imported here so desktop/mock runs never load the Blinka stack
+    import board
+    import busio
+    from adafruit_lsm6ds.ism330dhcx import ISM330DHCX
+    i2c = busio.I2C(board.SCL, board.SDA)
+    return ISM330DHCX(i2c)
+
+def open_backend(name):
+    """Returns (sensor, device_key). sensor is None for the mock backend.
+    device_key identifies the physical sensor for the calibration cache."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown IMU backend {name!r}, expected one of {BACKENDS}")
+    if name == "mock":
+        print("[Hardware] IMU backend: mock")
+        return None, "mock"
+    if name == "replay":
+        print(f"[Hardware] IMU backend: replay {IMU_REPLAY_FILE}")
+        return ReplaySensor(IMU_REPLAY_FILE), f"replay:{IMU_REPLAY_FILE}"
+    try:
+        sensor = _open_real()
+    except Exception as e:
+        if name == "real":
+            raise
+        print(f"[Hardware] IMU Error (Running in Mock Mode): {e}")
+        return None, "mock"
+    print("[Hardware] IMU found.")
+    address = sensor.i2c_device.device_address
+    return sensor, f"{socket.gethostname()}:ism330dhcx:0x{address:02x}"
@@ -0,0 +1,222 @@
+import math
+import struct
+from collections import deque
+
+# ====== ISM330DHCX FIFO registers (datasheet section 9) ======
+FIFO_CTRL1        = 0x07   # watermark [7:0]
+FIFO_CTRL2        = 0x08   # watermark [8]
+FIFO_CTRL3        = 0x09   # BDR_GY [7:4] | BDR_XL [3:0]
+FIFO_CTRL4        = 0x0A   # DEC_TS_BATCH [7:6] | FIFO_MODE [2:0]
+CTRL10_C          = 0x19   # TIMESTAMP_EN [5]
+FIFO_STATUS1      = 0x3A   # DIFF_FIFO [7:0]
+FIFO_STATUS2      = 0x3B   # WTM_IA [7] | OVR_IA [6] | FULL_IA [5] | DIFF_FIFO [9:8]
+FIFO_DATA_OUT_TAG = 0x78   # tag byte, followed by 6 data bytes (0x79-0x7E)
+
+FIFO_MODE_BYPASS     = 0x0
+FIFO_MODE_CONTINUOUS = 0x6
+TIMESTAMP_EN         = 0x20
+DEC_TS_1             = 0x40   # one timestamp word per batch
+
+TAG_GYRO      = 0x01
+TAG_ACCEL     = 0x02
+TAG_TIMESTAMP = 0x04
+
+WORD_SIZE    = 7
+TIMESTAMP_S  = 25e-6       # timestamp LSB
+FIFO_WORDS   = 512
+OVR_FLAG     = 0x40
+
+# Batch data rate codes, same encoding as the ODR field
+BDR_CODES = {12.5: 0x1, 26: 0x2, 52: 0x3, 104: 0x4, 208: 0x5, 416: 0x6, 833: 0x7, 1666: 0x8}
+
+G = 9.80665
+# Adafruit driver defaults: +-4 g and +-250 dps
+DEFAULT_ACCEL_MG_LSB  = 0.122
+DEFAULT_GYRO_MDPS_LSB = 8.75
+
+_WORD = struct.Struct("<Bhhh")
+_TS   = struct.Struct("<I")
+
+class I2CRegisterBus:
+    """Register access through the adafruit_bus_device I2CDevice the sensor
+    driver already owns (sensor.i2c_device)."""
+
+    def __init__(self, i2c_device):
+        self.device = i2c_device
+        self.transactions = 0
+
+    def read(self, reg, n):
+        buf = bytearray(n)
+        with self.device as i2c:
+            i2c.write_then_readinto(bytes((reg,)), buf)
+        self.transactions += 1
+        return buf
+
+    def write(self, reg, value):
+        with self.device as i2c:
+            i2c.write(bytes((reg, value)))
+        self.transactions += 1
+
+class FakeFifoBus:
+    """In-memory stand-in for the sensor's register file and FIFO.
+    push() encodes samples exactly as the chip would, so the drain/decode path
+    of Ism330Fifo can run without hardware."""
+
+    def __init__(self, accel_mg_lsb=DEFAULT_ACCEL_MG_LSB, gyro_mdps_lsb=DEFAULT_GYRO_MDPS_LSB,
+                 capacity=FIFO_WORDS):
+        self.accel_mg_lsb = accel_mg_lsb
+        self.gyro_mdps_lsb = gyro_mdps_lsb
+        self.capacity = capacity
+        self.regs = {}
+        self.words = deque()
+        self.overrun = False
+        self.transactions = 0
+
+    def _put(self, word):
+        if len(self.words) >= self.capacity:
+            self.words.popleft()
+            self.overrun = True
+        self.words.append(word)
+
+    def push(self, t, accel, gyro):
+        """Queue one batch: timestamp, gyro and accel words.
+        t in seconds, accel in m/s^2, gyro in rad/s (driver units)."""
+        if self.regs.get(FIFO_CTRL4, 0) & 0x7 == FIFO_MODE_BYPASS:
+            return
+        if self.regs.get(CTRL10_C, 0) & TIMESTAMP_EN:
+            ticks = int(round(t / TIMESTAMP_S)) & 0xFFFFFFFF
+            self._put(bytes((TAG_TIMESTAMP << 3,)) + _TS.pack(ticks) + bytes(2))
+        g = [int(round(math.degrees(v) * 1000.0 / self.gyro_mdps_lsb)) for v in gyro]
+        self._put(_WORD.pack(TAG_GYRO << 3, *g))
+        a = [int(round(v / G * 1000.0 / self.accel_mg_lsb)) for v in accel]
+        self._put(_WORD.pack(TAG_ACCEL << 3, *a))
+
+    def read(self, reg, n):
+        self.transactions += 1
+        if reg == FIFO_STATUS1:
+            count = len(self.words)
+            status2 = (count >> 8) & 0x3
+            if self.overrun:
+                status2 |= OVR_FLAG
+                self.overrun = False
+            return bytearray((count & 0xFF, status2))[:n]
+        if reg == FIFO_DATA_OUT_TAG:
+            out = bytearray()
+            for _ in range(n // WORD_SIZE):
+                if not self.words:
+                    break
+                out += self.words.popleft()
+            return out
+        return bytearray(self.regs.get(reg + i, 0) for i in range(n))
+
+    def write(self, reg, value):
+        self.transactions += 1
+        self.regs[reg] = value
+        if reg == FIFO_CTRL4 and value & 0x7 == FIFO_MODE_BYPASS:
+            self.words.clear()
+
+class Ism330Fifo:
+    """Configures the on-chip FIFO and drains it in bulk reads.
+    drain() returns (t, ax, ay, az, gx, gy, gz) tuples in driver units, with
+    t taken from the sensor's own timestamp counter. After an overrun the
+    FIFO has lost its oldest words, so samples are dropped until the next
+    timestamp word rather than stamped with the pre-overflow time."""
+
+    def __init__(self, bus, rate_hz=208, accel_mg_lsb=DEFAULT_ACCEL_MG_LSB,
+                 gyro_mdps_lsb=DEFAULT_GYRO_MDPS_LSB, burst_words=32):
+        self.bus = bus
+        self.rate_hz = rate_hz
+        self.accel_scale = accel_mg_lsb * G / 1000.0
+        self.gyro_scale = math.radians(gyro_mdps_lsb / 1000.0)
+        self.burst_words = burst_words
+        self._ticks = None
+        self._t = 0.0
+        self._gyro = None
+        self._accel = None
+        self._resync = False
+        self.samples = 0
+        self.words = 0
+        self.overruns = 0
+        self.discarded = 0
+
+    def configure(self):
+        code = BDR_CODES[self.rate_hz]
+        self.bus.write(FIFO_CTRL4, FIFO_MODE_BYPASS)   # flush
+        self.bus.write(FIFO_CTRL1, 0)
+        self.bus.write(FIFO_CTRL2, 0)
+        self.bus.write(FIFO_CTRL3, (code << 4) | code)
+        self.bus.write(CTRL10_C, TIMESTAMP_EN)
+        self.bus.write(FIFO_CTRL4, DEC_TS_1 | FIFO_MODE_CONTINUOUS)
+
+    def flush(self):
+        """Drop everything buffered, e.g. after a long stretch without drains."""
+        self.bus.write(FIFO_CTRL4, FIFO_MODE_BYPASS)
+        self.bus.write(FIFO_CTRL4, DEC_TS_1 | FIFO_MODE_CONTINUOUS)
+        self._gyro = self._accel = None
+        self._ticks = None
+        self._resync = False
+
+    def pending(self):
+        lo, hi = self.bus.read(FIFO_STATUS1, 2)
+        if hi & OVR_FLAG:
+            self.overruns += 1
+            # Half a batch may be gone; only a timestamp word is a safe restart
+            self._gyro = self._accel = None
+            self._resync = self._ticks is not None
+        return lo | ((hi & 0x3) << 8)
+
+    def drain(self):
+        out = []
+        remaining = self.pending()
+        while remaining > 0:
+            n = min(remaining, self.burst_words)
+            buf = self.bus.read(FIFO_DATA_OUT_TAG, n * WORD_SIZE)
+            got = len(buf) // WORD_SIZE
+            self._decode(buf, got, out)
+            if got < n:
+                break
+            remaining -= n
+        return out
+
+    def _decode(self, buf, count, out):
+        for i in range(count):
+            tag, x, y, z = _WORD.unpack_from(buf, i * WORD_SIZE)
+            tag >>= 3
+            self.words += 1
+            if tag == TAG_TIMESTAMP:
+                ticks = _TS.unpack_from(buf, i * WORD_SIZE + 1)[0]
+                if self._ticks is not None:
+                    # 32-bit counter, wraps after ~30 h
+                    self._t += ((ticks - self._ticks) & 0xFFFFFFFF) * TIMESTAMP_S
+                else:
+                    self._t = ticks * TIMESTAMP_S
+                self._ticks = ticks
+                self._resync = False
+            elif tag == TAG_GYRO:
+                s = self.gyro_scale
+                self._gyro = (x * s, y * s, z * s)
+            elif tag == TAG_ACCEL:
+                s = self.accel_scale
+                self._accel = (x * s, y * s, z * s)
+            else:
+                continue
+            if self._gyro is not None and self._accel is not None:
+                if self._resync:
+                    self._gyro = self._accel = None
+                    self.discarded += 1
+                    continue
+                if self._ticks is None:
+                    # No timestamp words: fall back to the nominal batch rate
+                    self._t += 1.0 / self.rate_hz
+                out.append((self._t,) + self._accel + self._gyro)
+                self._gyro = self._accel = None
+                self.samples += 1
+
+    def stats(self):
+        return {
+            "samples": self.samples,
+            "words": self.words,
+            "overruns": self.overruns,
+            "discarded": self.discarded,
+            "transactions": self.bus.transactions,
+        }
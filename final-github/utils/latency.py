@@ -0,0 +1,129 @@
+"""End-to-end input latency: from the moment an IMU sample or touch report
+is captured, through the frame that consumes it, to the present() that
+puts that frame on the panel.
+
+All times are time.perf_counter() seconds. evdev timestamps are wall clock
+(CLOCK_REALTIME), so they go through from_wall() first. "Photon" is when
+present() returns; the panel's own refresh is not included."""
+import json
+import time
+from array import array
+
+from constants.global_var import LATENCY_TRACE, LATENCY_BIN_MS, LATENCY_MAX_MS, LATENCY_DUMP
+
+def _noop(*args, **kwargs):
+    pass
+
+class Histogram:
+    """Fixed-width bins in ms; the last bin collects everything beyond max_ms."""
+
+    def __init__(self, bin_ms=LATENCY_BIN_MS, max_ms=LATENCY_MAX_MS):
+        self.bin_ms = bin_ms
+        self.counts = array("L", bytes(array("L").itemsize * (int(max_ms / bin_ms) + 1)))
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000.0
+        i = int(ms / self.bin_ms) if ms > 0 else 0
+        self.counts[min(i, len(self.counts) - 1)] += 1
+        self.n += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, p):
+        """Upper edge of the bin holding the p-th percentile, in ms."""
+        if not self.n:
+            return 0.0
+        rank = p / 100.0 * self.n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min((i + 1) * self.bin_ms, self.max)
+        return self.max
+
+    def to_dict(self):
+        counts = list(self.counts)
+        while counts and not counts[-1]:
+            counts.pop()
+        return {
+            "n": self.n,
+            "mean_ms": self.total / self.n if self.n else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max,
+            "bin_ms": self.bin_ms,
+            "counts": counts,
+        }
+
+class LatencyTracer:
+    """Inputs are reported with consumed(source, capture_time) by the code
+    that acts on them; presented() closes every input consumed since the
+    last present. Like FrameProfiler, all methods are no-ops when disabled."""
+
+    def __init__(self, enabled=LATENCY_TRACE, bin_ms=LATENCY_BIN_MS, max_ms=LATENCY_MAX_MS,
+                 dump_path=LATENCY_DUMP, wall_resync=1.0):
+        self.enabled = enabled
+        if not enabled:
+            self.from_wall = self.consumed = self.presented = _noop
+            return
+        self.bin_ms = bin_ms
+        self.max_ms = max_ms
+        self.dump_path = dump_path
+        self.hists = {}
+        self._pending = []
+        # perf_counter = wall - offset. Re-taken every wall_resync seconds:
+        # without an RTC, NTP steps the wall clock some time after boot
+        self.wall_resync = wall_resync
+        self._wall_at = None
+        self._wall_offset = 0.0
+
+    def from_wall(self, t):
+        now = time.perf_counter()
+        if self._wall_at is None or now - self._wall_at >= self.wall_resync:
+            self._wall_offset = time.time() - now
+            self._wall_at = now
+        return t - self._wall_offset
+
+    def _hist(self, source, stage):
+        key = (source, stage)
+        h = self.hists.get(key)
+        if h is None:
+            h = self.hists[key] = Histogram(self.bin_ms, self.max_ms)
+        return h
+
+    def consumed(self, source, capture_t):
+        if capture_t is None:
+            return
+        now = time.perf_counter()
+        self._hist(source, "capture_to_consume").add(now - capture_t)
+        self._pending.append((source, capture_t, now))
+
+    def presented(self):
+        if not self._pending:
+            return
+        now = time.perf_counter()
+        for source, capture_t, consume_t in self._pending:
+            self._hist(source, "consume_to_present").add(now - consume_t)
+            self._hist(source, "capture_to_present").add(now - capture_t)
+        self._pending.clear()
+
+    def summary(self):
+        """{source: {stage: (n, p50, p95, max)}} for a one-line printout."""
+        out = {}
+        for (source, stage), h in sorted(self.hists.items()):
+            out.setdefault(source, {})[stage] = (h.n, round(h.percentile(50), 2),
+                                                 round(h.percentile(95), 2), round(h.max, 2))
+        return out
+
+    def dump(self, path=None):
+        """Full histograms as JSON, one object per source and stage."""
+        data = {}
+        for (source, stage), h in self.hists.items():
+            data.setdefault(source, {})[stage] = h.to_dict()
+        with open(path or self.dump_path, "w") as f:
+            json.dump(dict(data, time=time.time()), f, indent=1)
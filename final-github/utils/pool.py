@@ -0,0 +1,62 @@
+class PooledSprite:
+    """Mixin for sprites owned by a SpritePool.
+    kill() hands the sprite back to its pool instead of dropping it."""
+    pool = None
+    pooled = False
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None and not self.pooled:
+            self.pool.release(self)
+
+class SpritePool:
+    """Fixed-capacity pool of reusable sprites.
+    Every instance is created up front; acquire() only resets and re-adds."""
+
+    def __init__(self, factory, capacity):
+        self.capacity = capacity
+        self._free = []
+        for _ in range(capacity):
+            sprite = factory()
+            sprite.pool = self
+            sprite.pooled = True
+            self._free.append(sprite)
+        self.high_water = 0
+        self.exhausted = 0
+
+    def acquire(self, x, y, *groups):
+        """Returns a reset sprite added to groups, or None if the pool is empty."""
+        if not self._free:
+            self.exhausted += 1
+            return None
+        sprite = self._free.pop()
+        sprite.pooled = False
+        sprite.reset(x, y)
+        sprite.add(*groups)
+        in_use = self.capacity - len(self._free)
+        if in_use > self.high_water:
+            self.high_water = in_use
+        return sprite
+
+    def release(self, sprite):
+        if sprite.pooled:
+            return
+        sprite.pooled = True
+        self._free.append(sprite)
+
+    @property
+    def in_use(self):
+        return self.capacity - len(self._free)
+
+    @property
+    def free(self):
+        return len(self._free)
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "free": self.free,
+            "high_water": self.high_water,
+            "exhausted": self.exhausted,
+        }
@@ -0,0 +1,142 @@
+import json
+import time
+from array import array
+
+import pygame
+from constants.global_var import (FPS, PROFILER_ENABLED, PROFILER_OVERLAY, PROFILER_FRAMES,
+                                  PROFILER_DUMP, PROFILER_DUMP_SECONDS)
+
+PHASES = ("touch", "tick", "input", "imu", "update", "collision", "draw", "flip")
+PHASE_COLORS = ((120, 120, 255), (60, 60, 60), (0, 200, 200), (255, 160, 0),
+                (0, 200, 0), (200, 0, 200), (255, 255, 100), (200, 0, 0))
+
+def _noop(*args, **kwargs):
+    pass
+
+class FrameProfiler:
+    """Per-phase frame timing kept in a fixed-size ring buffer.
+
+    Phases are timed back to back: mark(name) charges the time since the
+    previous mark (or begin_frame) to `name`, adding up if a phase runs more
+    than once per frame. When disabled every method is a no-op, so the loop
+    can call them unconditionally."""
+
+    def __init__(self, enabled=PROFILER_ENABLED, frames=PROFILER_FRAMES, overlay=PROFILER_OVERLAY,
+                 dump_path=PROFILER_DUMP, dump_seconds=PROFILER_DUMP_SECONDS):
+        self.enabled = enabled
+        if not enabled:
+            self.begin_frame = self.mark = self.end_frame = self.draw_overlay = _noop
+            return
+        self.frames = frames
+        self.overlay = overlay
+        self.dump_path = dump_path
+        self.dump_seconds = dump_seconds
+        self._index = {name: i for i, name in enumerate(PHASES)}
+        self._cols = len(PHASES) + 1          # phases + frame total
+        self._ring = array("d", bytes(8 * frames * self._cols))
+        self._cur = [0.0] * len(PHASES)
+        self._row = 0
+        self.count = 0
+        self._start = self._last = time.perf_counter()
+        self._next_dump = self._start + dump_seconds
+        self._font = None
+        self._surf = None
+        self._next_overlay = 0.0
+
+    def begin_frame(self):
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self._cur[self._index[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        now = time.perf_counter()
+        base = self._row * self._cols
+        ring, cur = self._ring, self._cur
+        for i in range(len(cur)):
+            ring[base + i] = cur[i]
+            cur[i] = 0.0
+        ring[base + len(cur)] = now - self._start
+        self._row = (self._row + 1) % self.frames
+        self.count += 1
+        if self.dump_path and now >= self._next_dump:
+            self._next_dump = now + self.dump_seconds
+            self.dump()
+
+    def summary(self):
+        n = min(self.count, self.frames)
+        if n == 0:
+            return {"frames": 0}
+        cols = self._cols
+        ring = self._ring
+        totals = [ring[r * cols + len(PHASES)] for r in range(n)]
+        mean_total = sum(totals) / n
+        phases = {}
+        for i, name in enumerate(PHASES):
+            phases[name] = sum(ring[r * cols + i] for r in range(n)) / n * 1000.0
+        return {
+            "frames": n,
+            "fps": 1.0 / mean_total if mean_total else 0.0,
+            "mean_ms": mean_total * 1000.0,
+            "worst_ms": max(totals) * 1000.0,
+            "phase_ms": phases,
+        }
+
+    def dump(self):
+        # One JSON line per dump, appended
+        with open(self.dump_path, "a") as f:
+            f.write(json.dumps(dict(self.summary(), time=time.time())) + "\n")
+
+    def draw_overlay(self, renderer):
+        if not self.overlay:
+            return
+        now = time.perf_counter()
+        if self._surf is None or now >= self._next_overlay:
+            # Re-rasterize twice a second; blitting the cached surface is cheap
+            self._next_overlay = now + 0.5
+            self._surf = self._render_overlay()
+        renderer.draw_hud(self._surf, (renderer.screen.get_width() - self._surf.get_width() - 4, 4))
+
+    def _render_overlay(self):
+        if self._font is None:
+            self._font = pygame.font.Font(None, 16)
+        s = self.summary()
+        width = 120
+        surf = pygame.Surface((width, 34))
+        surf.fill((0, 0, 0))
+        if s["frames"]:
+            text = f"{s['fps']:.0f} fps  worst {s['worst_ms']:.1f} ms"
+            surf.blit(self._font.render(text, True, (255, 255, 255)), (2, 2))
+            # Stacked bar: the full width is one frame budget at FPS
+            scale = width / (1000.0 / FPS)
+            x = 0
+            for name, color in zip(PHASES, PHASE_COLORS):
+                w = int(round(s["phase_ms"][name] * scale))
+                if w > 0:
+                    pygame.draw.rect(surf, color, (x, 16, w, 4))
+                    x += w
+            # Busiest phase, ignoring time spent idle in clock.tick()
+            top = max((p for p in PHASES if p != "tick"), key=lambda p: s["phase_ms"][p])
+            surf.blit(self._font.render(f"{top} {s['phase_ms'][top]:.1f} ms", True, (200, 200, 200)), (2, 21))
+        return surf.convert()
+
+class StartupTimer:
+    """Milestones from process start to the first frame on screen."""
+
+    def __init__(self, t0=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self):
+        out = {}
+        last = self.t0
+        for name, t in self.marks:
+            out[name] = round((t - last) * 1000.0, 1)
+            last = t
+        out["total"] = round((last - self.t0) * 1000.0, 1)
+        return out
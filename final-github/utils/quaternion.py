@@ -0,0 +1,98 @@
+import math
+
+class Quaternion:
+    def __init__(self, w, x, y, z):
+        self.w, self.x, self.y, self.z = w, x, y, z
+    
+    def normalize(self):
+        n = math.sqrt(self.w*self.w + self.x*self.x + self.y*self.y + self.z*self.z)
+        if n == 0: return self
+        self.w/=n; self.x/=n; self.y/=n; self.z/=n
+        return self
+
+    def __mul__(self, o):
+        return Quaternion(
+            self.w*o.w - self.x*o.x - self.y*o.y - self.z*o.z,
+            self.w*o.x + self.x*o.w + self.y*o.z - self.z*o.y,
+            self.w*o.y - self.x*o.z + self.y*o.w + self.z*o.x,
+            self.w*o.z + self.x*o.y - self.y*o.x + self.z*o.w
+        )
+
+    def to_euler(self):
+        sinr = 2*(self.w*self.x + self.y*self.z)
+        cosr = 1 - 2*(self.x*self.x + self.y*self.y)
+        roll = math.atan2(sinr, cosr)
+        
+        sinp = 2*(self.w*self.y - self.z*self.x)
+        if abs(sinp)>=1: pitch = math.copysign(math.pi/2, sinp)
+        else: pitch = math.asin(sinp)
+        
+        return math.degrees(roll), math.degrees(pitch)
+
+class FastQuaternion:
+    """Mutable quaternion for the hot filter loop: __slots__, in-place ops and
+    a fused filter step, so a sample allocates nothing.
+    Arithmetic follows Quaternion operation for operation, so results match
+    the object-based path bit for bit."""
+    __slots__ = ("w", "x", "y", "z")
+
+    def __init__(self, w, x, y, z):
+        self.w, self.x, self.y, self.z = w, x, y, z
+
+    @classmethod
+    def from_accel(cls, ax, ay, az):
+        """Initial orientation (yaw = 0) from a gravity vector."""
+        roll = math.atan2(ay, az)
+        pitch = math.atan2(-ax, math.sqrt(ay*ay + az*az))
+
+        cr = math.cos(roll/2)
+        sr = math.sin(roll/2)
+        cp = math.cos(pitch/2)
+        sp = math.sin(pitch/2)
+
+        return cls(cr*cp, sr*cp, cr*sp, -sr*sp).normalize()
+
+    def normalize(self):
+        w, x, y, z = self.w, self.x, self.y, self.z
+        n = math.sqrt(w*w + x*x + y*y + z*z)
+        if n == 0: return self
+        self.w = w/n; self.x = x/n; self.y = y/n; self.z = z/n
+        return self
+
+    def imul(self, ow, ox, oy, oz):
+        """self = self * (ow, ox, oy, oz), in place."""
+        w, x, y, z = self.w, self.x, self.y, self.z
+        self.w = w*ow - x*ox - y*oy - z*oz
+        self.x = w*ox + x*ow + y*oz - z*oy
+        self.y = w*oy - x*oz + y*ow + z*ox
+        self.z = w*oz + x*oy - y*ox + z*ow
+        return self
+
+    def integrate(self, ax, ay, az, gx, gy, gz, dt, beta):
+        """Gyro integration + accelerometer correction in one step.
+        gx/gy/gz must already have the bias removed."""
+        self.imul(1.0, gx*dt*0.5, gy*dt*0.5, gz*dt*0.5).normalize()
+
+        accel_norm = math.sqrt(ax*ax + ay*ay + az*az)
+        if accel_norm > 0.1:
+            axn, ayn, azn = ax/accel_norm, ay/accel_norm, az/accel_norm
+            w, x, y, z = self.w, self.x, self.y, self.z
+            vx = 2*(x*z - w*y)
+            vy = 2*(y*z + w*x)
+            vz = w*w - x*x - y*y + z*z
+
+            ex = (ayn*vz) - (azn*vy)
+            ey = (azn*vx) - (axn*vz)
+            ez = (axn*vy) - (ayn*vx)
+
+            self.imul(1.0, beta*ex, beta*ey, beta*ez).normalize()
+
+    def to_euler(self):
+        w, x, y, z = self.w, self.x, self.y, self.z
+        roll = math.atan2(2*(w*x + y*z), 1 - 2*(x*x + y*y))
+
+        sinp = 2*(w*y - z*x)
+        if abs(sinp)>=1: pitch = math.copysign(math.pi/2, sinp)
+        else: pitch = math.asin(sinp)
+
+        return math.degrees(roll), math.degrees(pitch)
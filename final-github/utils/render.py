@@ -0,0 +1,198 @@
+import random
+
+import pygame
+from constants.global_var import (DIRTY_RENDERING, BG_COLOR, BG_STARS, BG_BUTTON_BAR,
+                                  BG_SCROLL_SPEED, BUTTON_BAR, GRAY, CYAN)
+
+class Background:
+    """Pre-rendered backdrop: colour, starfield and button bar are drawn once
+    into display-format surfaces. With a scroll speed (px/s) the starfield is
+    moved with two wraparound blits whenever it crosses a whole pixel; the
+    button bar stays put on top."""
+
+    def __init__(self, size, color=BG_COLOR, stars=BG_STARS, button_bar=BG_BUTTON_BAR,
+                 scroll_speed=BG_SCROLL_SPEED, seed=0):
+        self.size = size
+        self.scroll_speed = scroll_speed
+        self.layer = pygame.Surface(size).convert()
+        self.layer.fill(color)
+        # Own RNG: the starfield must not shift the game's random sequence
+        rng = random.Random(seed)
+        for _ in range(stars):
+            c = rng.randint(80, 255)
+            self.layer.set_at((rng.randrange(size[0]), rng.randrange(size[1])), (c, c, c))
+
+        self.bar = None
+        if button_bar:
+            self.bar = pygame.Surface(BUTTON_BAR.size).convert()
+            self.bar.fill(GRAY)
+            pygame.draw.line(self.bar, CYAN, (0, 0), (BUTTON_BAR.width, 0))
+
+        self.offset = 0.0
+        self._y = 0
+        if scroll_speed:
+            self.view = pygame.Surface(size).convert()
+            self._compose(0)
+        else:
+            # Static: the layer is the view
+            self.view = self.layer
+            if self.bar is not None:
+                self.view.blit(self.bar, BUTTON_BAR)
+
+    def _compose(self, y):
+        self.view.blit(self.layer, (0, y))
+        self.view.blit(self.layer, (0, y - self.size[1]))
+        if self.bar is not None:
+            self.view.blit(self.bar, BUTTON_BAR)
+
+    def advance(self, dt):
+        """Scroll by dt seconds. Returns True if the view changed."""
+        if not self.scroll_speed:
+            return False
+        self.offset = (self.offset + self.scroll_speed * dt) % self.size[1]
+        y = int(self.offset)
+        if y == self._y:
+            return False
+        self._y = y
+        self._compose(y)
+        return True
+
+class Renderer:
+    """Composites a frame from three layers: the cached background, the
+    sprite groups and the HUD. Either the classic way (blit background +
+    draw + flip) or, with DIRTY_RENDERING, by erasing/redrawing only what
+    moved and passing just those rects to display.update(). HUD items are
+    only recomposited when their surface changes or a sprite touched them.
+    presenter (e.g. a FramebufferPresenter) replaces the pygame.display calls."""
+
+    def __init__(self, screen, dirty=DIRTY_RENDERING, background=None, presenter=None):
+        self.screen = screen
+        self.dirty = dirty
+        self.presenter = presenter
+        if background is None:
+            background = Background(screen.get_size())
+        self.backdrop = background
+        self._groups = []
+        self._stores = []
+        self._drawn = {}        # entity store -> (positions, screen rects) of the last draw
+        self._hud = {}          # pos -> (surface, rect) currently on screen
+        self._rects = []
+        self._full = True
+        self._scrolled = False
+        self.pushed_pixels = 0
+        self.hud_blits = 0
+
+    @property
+    def background(self):
+        return self.backdrop.view
+
+    def invalidate(self):
+        # Next present() pushes the whole screen (mode change, overlay, ...)
+        self._full = True
+
+    def clear_screen(self):
+        self.screen.blit(self.background, (0, 0))
+        self.invalidate()
+
+    def scroll(self, dt):
+        if self.backdrop.advance(dt):
+            self._scrolled = True
+
+    def begin_frame(self):
+        self._groups.clear()
+        self._stores.clear()
+        if not self.dirty or self._scrolled:
+            # Whole background redrawn: nothing to erase piecemeal
+            self.screen.blit(self.background, (0, 0))
+            if self.dirty:
+                self._full = True
+
+    def draw_group(self, group):
+        """group should be a RenderUpdates so draw() reports changed rects."""
+        self._groups.append(group)
+        if self.dirty and not self._scrolled:
+            group.clear(self.screen, self.background)
+            self._rects.extend(group.draw(self.screen))
+        else:
+            group.draw(self.screen)
+
+    def clear_entities(self, store):
+        """Erase an entity store's last frame. Call for every store before
+        drawing anything, so a later erase can't eat a fresh sprite."""
+        drawn = self._drawn.get(store)
+        if not drawn:
+            return
+        if self.dirty and not self._scrolled:
+            bg = self.background
+            self.screen.blits([(bg, r, r) for r in drawn[1]], False)
+            self._rects.extend(drawn[1])
+
+    def draw_entities(self, store, image, alpha):
+        """One Surface.blits() call for every alive entity in store."""
+        positions = list(store.positions(alpha))
+        rects = self.screen.blits([(image, pos) for pos in positions])
+        self._drawn[store] = (positions, rects)
+        self._stores.append((store, image))
+        if self.dirty:
+            self._rects.extend(rects)
+
+    def _restore(self, area):
+        # Background plus the sprites already drawn there this frame, clipped
+        screen = self.screen
+        screen.set_clip(area)
+        screen.blit(self.background, area, area)
+        for group in self._groups:
+            for s in group.sprites():
+                if s.rect.colliderect(area):
+                    screen.blit(s.image, s.rect)
+        for store, image in self._stores:
+            # Blit at the unclipped positions: edge rects are clipped to the screen
+            positions, rects = self._drawn[store]
+            for pos, r in zip(positions, rects):
+                if r.colliderect(area):
+                    screen.blit(image, pos)
+        screen.set_clip(None)
+
+    def draw_hud(self, surf, pos):
+        rect = surf.get_rect(topleft=pos)
+        if not self.dirty:
+            self.screen.blit(surf, rect)
+            self.hud_blits += 1
+            return
+        prev = self._hud.get(pos)
+        if (prev is not None and prev[0] is surf and not self._full
+                and rect.collidelist(self._rects) == -1):
+            return      # unchanged and no sprite drew over it
+        # Erase under the item first: re-blitting antialiased text over
+        # itself would thicken its edges
+        area = rect if prev is None else rect.union(prev[1])
+        self._restore(area)
+        self.screen.blit(surf, rect)
+        self._hud[pos] = (surf, rect)
+        self._rects.append(area)
+        self.hud_blits += 1
+
+    def _flip(self):
+        if self.presenter is not None:
+            self.presenter.present()
+        else:
+            pygame.display.flip()
+        self.pushed_pixels += self.screen.get_width() * self.screen.get_height()
+
+    def present(self):
+        if not self.dirty or self._full:
+            self._flip()
+        elif self._rects:
+            area = sum(r.width * r.height for r in self._rects)
+            if area >= self.screen.get_width() * self.screen.get_height():
+                # Crowded frame: the rects would push more than the whole screen
+                self._flip()
+            else:
+                if self.presenter is not None:
+                    self.presenter.present(self._rects)
+                else:
+                    pygame.display.update(self._rects)
+                self.pushed_pixels += area
+        self._rects.clear()
+        self._full = False
+        self._scrolled = False
@@ -0,0 +1,155 @@
+"""Compact binary recording of everything that feeds a game session, and a
+player that feeds it back for frame-exact, faster-than-real-time replays.
+
+Layout: header (magic, version, RNG seed), then records tagged by one byte:
+    F dt                  start of a frame, dt passed to the states
+    M type, x, y, button  mouse/touch event as delivered to pygame
+    K key                 key press
+    S                     shoot button edge
+    I roll, pitch         orientation returned by imu.update()
+The IMU is recorded after the filter, so a replay doesn't depend on the
+timing of the background sampler or FIFO."""
+import struct
+from collections import deque
+
+import pygame
+
+MAGIC = b"IMPS"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHQ")
+_FRAME  = struct.Struct("<cd")
+_MOUSE  = struct.Struct("<cBhhB")
+_KEY    = struct.Struct("<ci")
+_SHOOT  = struct.Struct("<c")
+_IMU    = struct.Struct("<cdd")
+_SIZES  = {b"F": _FRAME, b"M": _MOUSE, b"K": _KEY, b"S": _SHOOT, b"I": _IMU}
+
+# pygame event types <-> compact codes
+_MOUSE_TYPES = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
+class SessionRecorder:
+    def __init__(self, path, seed, buffer_size=1 << 16):
+        # Plain buffered append: one write() syscall per buffer_size bytes
+        self.f = open(path, "wb", buffering=buffer_size)
+        self.f.write(_HEADER.pack(MAGIC, VERSION, seed))
+        self.frames = 0
+
+    def frame(self, dt):
+        self.f.write(_FRAME.pack(b"F", dt))
+        self.frames += 1
+
+    def event(self, event):
+        if event.type in _MOUSE_TYPES:
+            x, y = event.pos
+            self.f.write(_MOUSE.pack(b"M", _MOUSE_TYPES.index(event.type), x, y,
+                                     getattr(event, "button", 1)))
+        elif event.type == pygame.KEYDOWN:
+            self.f.write(_KEY.pack(b"K", event.key))
+
+    def shoot(self):
+        self.f.write(_SHOOT.pack(b"S"))
+
+    def imu(self, roll, pitch):
+        self.f.write(_IMU.pack(b"I", roll, pitch))
+
+    def close(self):
+        self.f.close()
+
+class RecordingIMU:
+    """Wraps the real IMU handler and logs what the game actually consumed."""
+
+    def __init__(self, imu, recorder):
+        self.imu = imu
+        self.recorder = recorder
+
+    def update(self, dt):
+        roll, pitch = self.imu.update(dt)
+        self.recorder.imu(roll, pitch)
+        return roll, pitch
+
+    @property
+    def sample_time(self):
+        return self.imu.sample_time
+
+    def resync(self):
+        self.imu.resync()
+
+    def stop(self):
+        self.imu.stop()
+
+class _ReplayIMU:
+    def __init__(self, player):
+        self.player = player
+
+    def update(self, dt):
+        q = self.player._imu
+        return q.popleft() if q else self.player.last_orientation
+
+    def resync(self):
+        pass
+
+    def stop(self):
+        pass
+
+class _ReplayTouch:
+    """Stands in for pigame.PiTft: update() posts this frame's recorded events."""
+
+    def __init__(self, player):
+        self.player = player
+
+    def update(self):
+        for event in self.player._events:
+            pygame.event.post(event)
+
+class SessionPlayer:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        magic, version, self.seed = _HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} session log")
+        self.pos = _HEADER.size
+        self.frames = 0
+        self.dt = 0.0
+        self.shoots = 0
+        self.last_orientation = (0.0, 0.0)
+        self._events = []
+        self._imu = deque()
+        self.imu = _ReplayIMU(self)
+        self.touch = _ReplayTouch(self)
+
+    def next_frame(self):
+        """Load the next frame's records. Returns False at the end of the log."""
+        data = self.data
+        if self.pos >= len(data):
+            return False
+        _, self.dt = _FRAME.unpack_from(data, self.pos)
+        self.pos += _FRAME.size
+        self._events = []
+        self._imu.clear()
+        self.shoots = 0
+        while self.pos < len(data):
+            tag = data[self.pos:self.pos + 1]
+            if tag == b"F":
+                break
+            rec = _SIZES[tag]
+            fields = rec.unpack_from(data, self.pos)
+            self.pos += rec.size
+            if tag == b"M":
+                _, kind, x, y, button = fields
+                etype = _MOUSE_TYPES[kind]
+                if etype == pygame.MOUSEMOTION:
+                    self._events.append(pygame.event.Event(etype, pos=(x, y), rel=(0, 0),
+                                                           buttons=(True, False, False)))
+                else:
+                    self._events.append(pygame.event.Event(etype, pos=(x, y), button=button))
+            elif tag == b"K":
+                self._events.append(pygame.event.Event(pygame.KEYDOWN, key=fields[1]))
+            elif tag == b"S":
+                self.shoots += 1
+            elif tag == b"I":
+                self.last_orientation = fields[1:]
+                self._imu.append(self.last_orientation)
+        self.frames += 1
+        return True
@@ -0,0 +1,41 @@
+import pygame
+from constants.global_var import SCORE_DIGIT_ATLAS
+from utils.assets import texts
+
+class ScoreHUD:
+    """Score label that is only rebuilt when the value changes.
+    With the digit atlas, "Score: " and 0-9 are rasterized once and any
+    value is composed by blitting glyphs; otherwise the whole string goes
+    through the text cache."""
+
+    def __init__(self, font, color=(255, 255, 0), label="Score: ", atlas=SCORE_DIGIT_ATLAS):
+        self.font = font
+        self.color = color
+        self.label = label
+        self.atlas = atlas
+        self._value = None
+        self._surf = None
+        self.rebuilds = 0
+        if atlas:
+            self._label = font.render(label, True, color)
+            self._digits = [font.render(str(d), True, color) for d in range(10)]
+            self._height = max(g.get_height() for g in self._digits + [self._label])
+
+    def render(self, value):
+        if value != self._value:
+            self._value = value
+            self._surf = self._compose(value) if self.atlas else \
+                texts.text(self.font, f"{self.label}{value}", self.color)
+            self.rebuilds += 1
+        return self._surf
+
+    def _compose(self, value):
+        glyphs = [self._digits[int(c)] for c in str(value) if c.isdigit()]
+        width = self._label.get_width() + sum(g.get_width() for g in glyphs)
+        surf = pygame.Surface((width, self._height), pygame.SRCALPHA)
+        surf.blit(self._label, (0, 0))
+        x = self._label.get_width()
+        for g in glyphs:
+            surf.blit(g, (x, 0))
+            x += g.get_width()
+        return surf
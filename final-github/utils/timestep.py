@@ -0,0 +1,58 @@
+from constants.global_var import SIM_HZ, MAX_SIM_STEPS
+
+class FixedTimestep:
+    """Accumulator for a fixed-rate simulation under a variable render rate.
+    advance(frame_dt) says how many SIM_HZ steps to run this frame; alpha is
+    how far the render time is between the last two steps."""
+
+    def __init__(self, hz=SIM_HZ, max_steps=MAX_SIM_STEPS):
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.steps = 0
+        self.dropped_steps = 0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt):
+        self.accumulator += frame_dt
+        n = int(self.accumulator / self.dt)
+        if n > self.max_steps:
+            # Slow frame: run at most max_steps and forget the rest of the
+            # backlog, otherwise each catch-up frame gets slower (spiral of death)
+            self.dropped_steps += n - self.max_steps
+            n = self.max_steps
+            self.accumulator %= self.dt
+        else:
+            self.accumulator -= n * self.dt
+        self.steps += n
+        return n
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.dt, 1.0)
+
+class Interpolated:
+    """Mixin for sprites moved by the fixed-step simulation.
+    x/y hold the simulated top-left corner and prev_x/prev_y the one from the
+    step before; update() keeps rect on the simulated position for collisions,
+    interpolate() moves rect between the two for drawing."""
+    x = y = prev_x = prev_y = 0.0
+
+    def snap(self):
+        # Teleport (spawn/reset): no interpolation from the old position
+        self.prev_x, self.prev_y = self.x, self.y
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
+
+    def step_begin(self):
+        self.prev_x, self.prev_y = self.x, self.y
+
+    def step_end(self):
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
+
+    def interpolate(self, alpha):
+        self.rect.x = int(self.prev_x + (self.x - self.prev_x) * alpha)
+        self.rect.y = int(self.prev_y + (self.y - self.prev_y) * alpha)